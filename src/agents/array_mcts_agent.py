@@ -0,0 +1,82 @@
+import random
+from typing import Optional
+
+import numpy as np
+
+from agents.base import Agent
+from go import playout
+from go.goboard import GameState, Move
+from mcts_tree import PASS, ROOT, MCTSTree
+
+
+class ArrayMCTSAgent(Agent):
+    def __init__(
+        self,
+        num_rounds: int,
+        temperature: float,
+        max_nodes: int = 100_000,
+        seed: Optional[int] = None,
+    ):
+        super().__init__()
+        self.num_rounds = num_rounds
+        self.temperature = temperature
+        self.max_nodes = max_nodes
+        self.rng = random.Random(seed)
+        self.tree: Optional[MCTSTree] = None
+
+    def select_move(self, game_state: GameState) -> Move:
+        state = game_state.detach()
+        tree = MCTSTree(self.max_nodes)
+        max_moves = len(state.board.geometry.points) + 1
+        for i in range(self.num_rounds):
+            if not tree.has_room(max_moves):
+                tree.recycle()
+            self.perform_rollout(tree, state)
+        self.tree = tree
+        return self.get_best_move(tree, state)
+
+    def perform_rollout(self, tree: MCTSTree, state: GameState):
+        node = ROOT
+        path = [ROOT]
+        movers = [state.next_player.other]
+        while tree.is_expanded(node) and not state.is_over():
+            node = tree.select_child(node, self.temperature)
+            movers.append(state.next_player)
+            state.play(self.to_move(state, tree.move[node]))
+            path.append(node)
+
+        if not state.is_over() and tree.expand(node, self.candidate_moves(state)):
+            node = tree.select_child(node, self.temperature)
+            movers.append(state.next_player)
+            state.play(self.to_move(state, tree.move[node]))
+            path.append(node)
+
+        winner = playout.simulate(state, self.rng)
+        tree.backup(path, [1.0 if mover == winner else 0.0 for mover in movers])
+        for _ in range(len(path) - 1):
+            state.undo()
+
+    def candidate_moves(self, state: GameState) -> list[int]:
+        geometry = state.board.geometry
+        moves = [
+            PASS if move.is_pass else geometry.index(move.point)
+            for move in state.legal_moves()
+            if not move.is_resign
+        ]
+        self.rng.shuffle(moves)
+        return moves
+
+    @staticmethod
+    def to_move(state: GameState, index: int) -> Move:
+        if index == PASS:
+            return Move.pass_turn()
+        return Move.play(state.board.geometry.index_points[index])
+
+    def get_best_move(self, tree: MCTSTree, state: GameState) -> Move:
+        children = tree.children(ROOT)
+        visits = tree.visits[children.start : children.stop]
+        if not np.any(visits):
+            return Move.pass_turn()
+        win_pct = tree.wins[children.start : children.stop] / np.maximum(visits, 1)
+        best = children.start + int(np.argmax(np.where(visits > 0, win_pct, -1.0)))
+        return self.to_move(state, tree.move[best])
@@ -1,15 +1,21 @@
 import numpy as np
 
 from agents.base import Agent
-from agents.helpers import is_point_an_eye
+from go.batch import BoardBatch
 from go.goboard import GameState, Move
 
 
+def candidate_mask(game_state: GameState) -> np.ndarray:
+    batch = BoardBatch.from_game_states([game_state])
+    return (batch.legal_mask() & ~batch.eye_mask())[0]
+
+
 class DeepLearningAgent(Agent):
-    def __init__(self, model, encoder):
+    def __init__(self, model, encoder, greedy: bool = False):
         super().__init__()
         self.model = model
         self.encoder = encoder
+        self.greedy = greedy
 
     def predict(self, game_state: GameState):
         encoded_state = self.encoder.encode(game_state)
@@ -18,21 +24,17 @@ class DeepLearningAgent(Agent):
 
     def select_move(self, game_state: GameState):
         move_count = self.encoder.board_width * self.encoder.board_height
-        raw_probs = self.predict(game_state)
+        raw_probs = self.predict(game_state)[:move_count]
         eps = 1e-6
         clipped_probs = np.clip(raw_probs**3, eps, 1 - eps)
-        probs = clipped_probs / np.sum(clipped_probs)
-        candidates = np.arange(move_count)
-        ranked_moves = np.random.choice(
-            candidates, size=move_count, replace=False, p=probs
-        )
-        for i in ranked_moves:
-            point = self.encoder.decode_point_index(i)
-            move = Move.play(point)
-            if game_state.is_valid_move(move) and not is_point_an_eye(
-                game_state.board,
-                point,
-                game_state.next_player,
-            ):
+        probs = clipped_probs * candidate_mask(game_state).ravel()
+        while probs.any():
+            if self.greedy:
+                index = int(np.argmax(probs))
+            else:
+                index = np.random.choice(move_count, p=probs / np.sum(probs))
+            move = Move.play(self.encoder.decode_point_index(index))
+            if game_state.is_valid_move(move):
                 return move
+            probs[index] = 0
         return Move.pass_turn()
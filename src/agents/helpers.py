@@ -3,29 +3,20 @@ from go.gotypes import Point, Player
 
 
 def is_point_an_eye(board: Board, point: Point, color: Player) -> bool:
-    if board.get_go_string(point) is not None:
+    if board.get(point) is not None:
         return False
-    for neighbor in point.neighbors():
-        if board.is_on_grid(neighbor):
-            neighbor_color = board.get(neighbor)
-            if neighbor_color != color:
-                return False
+    for neighbor in board.geometry.point_neighbors[point]:
+        neighbor_color = board.get(neighbor)
+        if neighbor_color != color:
+            return False
 
     friendly_corners = 0
-    off_board_corners = 0
-    corners = [
-        Point(point.row - 1, point.col - 1),
-        Point(point.row - 1, point.col + 1),
-        Point(point.row + 1, point.col - 1),
-        Point(point.row + 1, point.col + 1),
-    ]
+    corners = board.geometry.point_diagonals[point]
+    off_board_corners = 4 - len(corners)
     for corner in corners:
-        if board.is_on_grid(corner):
-            corner_color = board.get(corner)
-            if corner_color == color:
-                friendly_corners += 1
-        else:
-            off_board_corners += 1
+        corner_color = board.get(corner)
+        if corner_color == color:
+            friendly_corners += 1
     if off_board_corners > 0:
         return off_board_corners + friendly_corners == 4
     return friendly_corners >= 3
@@ -1,10 +1,14 @@
 import math
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Optional
 
 from agents.base import Agent
-from agents.naive import RandomBot
+from go import playout
 from go.goboard import GameState, Move
-from go.gotypes import Player
-from mcts import MCTSNode
+from go.gotypes import Player, Point
+from mcts import MCTSNode, TranspositionTable
 
 
 def uct_score(
@@ -19,68 +23,320 @@ class MCTSAgent(Agent):
         self,
         num_rounds: int,
         temperature: float,
+        reuse_tree: bool = True,
+        num_workers: int = 1,
+        seed: Optional[int] = None,
+        max_transpositions: Optional[int] = None,
+        max_time_ms: Optional[float] = None,
+        early_stop: bool = True,
+        rave: bool = False,
+        rave_equivalence: float = 1000.0,
     ):
         super().__init__()
         self.num_rounds = num_rounds
         self.temperature = temperature
+        self.reuse_tree = reuse_tree
+        self.num_workers = num_workers
+        self.rng = random.Random(seed)
+        self.max_transpositions = max_transpositions
+        self.max_time_ms = max_time_ms
+        self.early_stop = early_stop
+        self.rave = rave
+        self.rave_equivalence = rave_equivalence
+        self.root: Optional[MCTSNode] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
 
-    def select_move(self, game_state: GameState) -> Move:
-        root = MCTSNode(game_state)
-        self.perform_rollouts(root)
+    def select_move(
+        self, game_state: GameState, max_time_ms: Optional[float] = None
+    ) -> Move:
+        if max_time_ms is None:
+            max_time_ms = self.max_time_ms
+        deadline = None
+        if max_time_ms is not None:
+            deadline = time.perf_counter() + max_time_ms / 1000
+        root = self.find_root(game_state) if self.reuse_tree else None
+        if root is None:
+            table = None
+            if self.max_transpositions is not None:
+                table = TranspositionTable(self.max_transpositions)
+            root = MCTSNode(game_state, table=table)
+        root.parent = None
+        if self.num_workers > 1:
+            self.perform_parallel_rollouts(root, deadline)
+        else:
+            self.perform_rollouts(root, deadline=deadline)
+        self.root = root if self.reuse_tree else None
         return self.get_best_move(game_state.next_player, root)
 
-    def perform_rollouts(self, root):
-        for i in range(self.num_rounds):
-            node = root
-            while not node.can_add_child() and not node.is_terminal():
-                node = self.select_child(node)
+    def find_root(
+        self, game_state: GameState, max_depth: int = 2
+    ) -> Optional[MCTSNode]:
+        if self.root is None:
+            return None
+        target = self.root_key(game_state)
+        nodes = [self.root]
+        for _ in range(max_depth + 1):
+            for node in nodes:
+                if self.root_key(node.game_state) == target:
+                    return node
+            nodes = [child for node in nodes for child in node.children]
+        return None
 
-            if node.can_add_child():
-                node = node.add_random_child()
-
-            winner = self.simulate_random_game(node.game_state)
+    @staticmethod
+    def root_key(game_state: GameState) -> tuple[int, bool, bool]:
+        last_move = game_state.last_move
+        return (
+            game_state.situation_hash(),
+            game_state.is_over(),
+            last_move is not None and last_move.is_pass,
+        )
 
-            while node is not None:
+    def perform_rollouts(
+        self,
+        root,
+        num_rounds: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ):
+        if num_rounds is None:
+            num_rounds = self.num_rounds
+        start = time.perf_counter()
+        for i in range(num_rounds):
+            if self.should_stop(root, num_rounds - i, i, start, deadline):
+                break
+            path = self.select_path(root)
+            if self.rave:
+                winner, played = playout.simulate_with_moves(
+                    path[-1].game_state, self.rng
+                )
+                self.record_amaf(path, winner, played)
+            else:
+                winner = self.simulate_random_game(path[-1].game_state, self.rng)
+            for node in path:
                 node.record_win(winner)
-                node = node.parent
+
+    @staticmethod
+    def record_amaf(
+        path: list[MCTSNode], winner: Player, played: dict[Player, set[Point]]
+    ):
+        for i in reversed(range(len(path))):
+            node = path[i]
+            player = node.game_state.next_player
+            points = played[player]
+            next_node = path[i + 1] if i + 1 < len(path) else None
+            edge = None
+            for child, move in zip(node.children, node.child_moves):
+                if child is next_node:
+                    edge = move
+                if move.is_play and (child is next_node or move.point in points):
+                    child.record_amaf(winner == player)
+            if edge is not None and edge.is_play:
+                points.add(edge.point)
+
+    def should_stop(
+        self,
+        root: MCTSNode,
+        rounds_left: int,
+        rounds_done: int,
+        start: float,
+        deadline: Optional[float],
+    ) -> bool:
+        if rounds_done == 0:
+            return False
+        if deadline is not None and time.perf_counter() >= deadline:
+            return True
+        if not self.early_stop:
+            return False
+        remaining = self.remaining_rounds(rounds_left, rounds_done, start, deadline)
+        return self.is_decided(root, remaining)
+
+    @staticmethod
+    def remaining_rounds(
+        rounds_left: int, rounds_done: int, start: float, deadline: Optional[float]
+    ) -> int:
+        if deadline is None:
+            return rounds_left
+        now = time.perf_counter()
+        rate = rounds_done / max(now - start, 1e-9)
+        return min(rounds_left, math.ceil(rate * (deadline - now)))
+
+    def is_decided(self, root: MCTSNode, remaining: int) -> bool:
+        if not root.children:
+            return False
+        ranked = sorted(root.children, key=lambda child: child.num_rollouts)
+        leader = ranked[-1]
+        runner_up = ranked[-2].num_rollouts if len(ranked) > 1 else 0
+        if leader.num_rollouts - runner_up <= remaining:
+            return False
+        player = root.game_state.next_player
+        best_pct = max(
+            child.winning_frac(player)
+            for child in root.children
+            if child.num_rollouts > 0
+        )
+        return leader.winning_frac(player) == best_pct
+
+    def select_path(self, root: MCTSNode) -> list[MCTSNode]:
+        path = [root]
+        node = root
+        while not node.can_add_child() and not node.is_terminal():
+            node = self.select_child(node)
+            if any(visited is node for visited in path):
+                return path
+            path.append(node)
+
+        if node.can_add_child():
+            child = node.add_random_child(self.rng)
+            if child is not None and not any(visited is child for visited in path):
+                path.append(child)
+        return path
+
+    def perform_parallel_rollouts(
+        self, root: MCTSNode, deadline: Optional[float] = None
+    ):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.num_workers)
+        max_time_ms = None
+        if deadline is not None:
+            max_time_ms = max(deadline - time.perf_counter(), 0) * 1000
+        game_state = root.game_state.detach()
+        rounds, extra = divmod(self.num_rounds, self.num_workers)
+        futures = [
+            self._executor.submit(
+                _search_root,
+                game_state,
+                rounds + (1 if worker < extra else 0),
+                self.temperature,
+                self.rng.getrandbits(64),
+                max_time_ms,
+                self.rave,
+            )
+            for worker in range(self.num_workers)
+        ]
+        for future in futures:
+            merge_root_stats(root, future.result())
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
     def get_best_move(self, player, root):
         best_move = None
         best_pct = -1.0
-        for child in root.children:
+        for child, move in zip(root.children, root.child_moves):
             child_pct = child.winning_frac(player)
             if child_pct > best_pct:
                 best_pct = child_pct
-                best_move = child.move
+                best_move = move
         return best_move
 
     def select_child(self, node: MCTSNode) -> MCTSNode:
-        total_rollouts = sum(child.num_rollouts for child in node.children)
+        total_rollouts = sum(
+            child.num_rollouts + child.virtual_losses for child in node.children
+        )
+        player = node.game_state.next_player
         best_score = -1.0
         best_child = None
         for child in node.children:
-            score = uct_score(
-                total_rollouts,
-                child.num_rollouts,
-                child.winning_frac(node.game_state.next_player),
-                self.temperature,
-            )
+            visits = child.num_rollouts + child.virtual_losses
+            win_pct = child.win_counts[player] / visits
+            if self.rave and child.amaf_rollouts > 0:
+                beta = math.sqrt(
+                    self.rave_equivalence / (3 * total_rollouts + self.rave_equivalence)
+                )
+                amaf_pct = child.amaf_wins / child.amaf_rollouts
+                win_pct = (1 - beta) * win_pct + beta * amaf_pct
+            score = uct_score(total_rollouts, visits, win_pct, self.temperature)
             if score > best_score:
                 best_score = score
                 best_child = child
         return best_child
 
     @staticmethod
-    def simulate_random_game(game_state: GameState) -> Player:
-        bots = {
-            Player.BLACK: RandomBot(
-                game_state.board.num_rows, game_state.board.num_cols
-            ),
-            Player.WHITE: RandomBot(
-                game_state.board.num_rows, game_state.board.num_cols
-            ),
-        }
-        while not game_state.is_over():
-            bot_move = bots[game_state.next_player].select_move(game_state)
-            game_state = game_state.apply_move(bot_move)
-        return game_state.winner()
+    def simulate_random_game(
+        game_state: GameState, rng: random.Random = random
+    ) -> Player:
+        return playout.simulate(game_state, rng)
+
+
+class TreeParallelMCTSAgent(MCTSAgent):
+    def perform_parallel_rollouts(
+        self, root: MCTSNode, deadline: Optional[float] = None
+    ):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.num_workers)
+        max_pending = 2 * self.num_workers
+        pending = {}
+        num_submitted = 0
+        num_rounds = self.num_rounds
+        start = time.perf_counter()
+        while num_submitted < num_rounds or pending:
+            rounds_left = num_rounds - num_submitted + len(pending)
+            if num_submitted < num_rounds and self.should_stop(
+                root, rounds_left, num_submitted, start, deadline
+            ):
+                num_rounds = num_submitted
+            while num_submitted < num_rounds and len(pending) < max_pending:
+                path = self.select_path(root)
+                for node in path:
+                    node.add_virtual_loss()
+                future = self._executor.submit(
+                    _rollout, path[-1].game_state.detach(), self.rng.getrandbits(64)
+                )
+                pending[future] = path
+                num_submitted += 1
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                winner = future.result()
+                for node in path:
+                    node.revert_virtual_loss()
+                    node.record_win(winner)
+
+
+def _rollout(game_state: GameState, seed: int) -> Player:
+    return playout.simulate(game_state, random.Random(seed))
+
+
+RootStats = list[tuple[Move, dict[Player, int], int]]
+
+
+def _search_root(
+    game_state: GameState,
+    num_rounds: int,
+    temperature: float,
+    seed: int,
+    max_time_ms: Optional[float] = None,
+    rave: bool = False,
+) -> RootStats:
+    agent = MCTSAgent(
+        num_rounds,
+        temperature,
+        reuse_tree=False,
+        seed=seed,
+        early_stop=False,
+        rave=rave,
+    )
+    deadline = None
+    if max_time_ms is not None:
+        deadline = time.perf_counter() + max_time_ms / 1000
+    root = MCTSNode(game_state)
+    agent.perform_rollouts(root, deadline=deadline)
+    return [
+        (move, child.win_counts, child.num_rollouts)
+        for child, move in zip(root.children, root.child_moves)
+    ]
+
+
+def merge_root_stats(root: MCTSNode, stats: RootStats):
+    for move, win_counts, num_rollouts in stats:
+        child = next(
+            (c for c, m in zip(root.children, root.child_moves) if m == move), None
+        )
+        if child is None:
+            child = root.add_child(move)
+        for player, wins in win_counts.items():
+            child.win_counts[player] += wins
+            root.win_counts[player] += wins
+        child.num_rollouts += num_rollouts
+        root.num_rollouts += num_rollouts
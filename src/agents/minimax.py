@@ -1,6 +1,11 @@
+import multiprocessing
 import random
+from collections import defaultdict
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from enum import Enum
+from typing import Optional
 
 from agents.base import Agent
 from go.goboard import GameState, Move
@@ -8,6 +13,7 @@ from go.gotypes import Player, Point
 
 MAX_SCORE = 999999
 MIN_SCORE = -999999
+MAX_KILLERS = 2
 
 
 class GameResult(Enum):
@@ -16,83 +22,211 @@ class GameResult(Enum):
     WIN = 3
 
 
+class Bound(Enum):
+    EXACT = 1
+    LOWER = 2
+    UPPER = 3
+
+
+@dataclass
+class TableEntry:
+    depth: int
+    score: int
+    bound: Bound
+    best_move: Optional[Move]
+
+
+class AlphaBetaSearch:
+    def __init__(
+        self, eval_fn: Callable[[GameState], int], max_table_size: int = 1_000_000
+    ):
+        self.eval_fn = eval_fn
+        self.max_table_size = max_table_size
+        self.table: dict[int, TableEntry] = {}
+        self.killers: dict[int, list[Move]] = defaultdict(list)
+        self.history: dict[tuple[Player, Point], int] = defaultdict(int)
+
+    def best_result(
+        self, game_state: GameState, depth: int, alpha: int, beta: int, ply: int = 0
+    ) -> int:
+        if game_state.is_over():
+            if game_state.winner() == game_state.next_player:
+                return MAX_SCORE
+            return MIN_SCORE
+
+        if depth == 0:
+            return self.eval_fn(game_state)
+
+        key = game_state.situation_hash()
+        entry = self.table.get(key)
+        table_move = None
+        if entry is not None:
+            table_move = entry.best_move
+            if entry.depth >= depth:
+                match entry.bound:
+                    case Bound.EXACT:
+                        return entry.score
+                    case Bound.LOWER:
+                        alpha = max(alpha, entry.score)
+                    case Bound.UPPER:
+                        beta = min(beta, entry.score)
+                if alpha >= beta:
+                    return entry.score
+
+        original_alpha = alpha
+        best_score = MIN_SCORE
+        best_move = None
+        for move in self.ordered_moves(game_state, ply, table_move):
+            game_state.play(move)
+            score = -self.best_result(game_state, depth - 1, -beta, -alpha, ply + 1)
+            game_state.undo()
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if move.is_play:
+                    self.record_cutoff(game_state.next_player, move, depth, ply)
+                break
+
+        if best_score <= original_alpha:
+            bound = Bound.UPPER
+        elif best_score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        if len(self.table) >= self.max_table_size:
+            self.table.clear()
+        self.table[key] = TableEntry(depth, best_score, bound, best_move)
+        return best_score
+
+    def record_cutoff(self, player: Player, move: Move, depth: int, ply: int):
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[MAX_KILLERS:]
+        self.history[player, move.point] += depth * depth
+
+    def ordered_moves(
+        self, game_state: GameState, ply: int, table_move: Optional[Move] = None
+    ) -> list[Move]:
+        moves = search_moves(game_state)
+        killers = self.killers.get(ply, [])
+        player = game_state.next_player
+
+        def priority(move: Move) -> tuple[int, int, int]:
+            history = self.history.get((player, move.point), 0) if move.is_play else 0
+            return move == table_move, move in killers, history
+
+        moves.sort(key=priority, reverse=True)
+        return moves
+
+
+def search_moves(game_state: GameState) -> list[Move]:
+    moves = [move for move in game_state.legal_moves() if move.is_play]
+    last_move = game_state.last_move
+    if not moves or (last_move is not None and last_move.is_pass):
+        moves.append(Move.pass_turn())
+    return moves
+
+
 class MinimaxAgent(Agent):
-    def __init__(self, max_depth: int, eval_fn: Callable[[GameState], int]):
+    def __init__(
+        self,
+        max_depth: int,
+        eval_fn: Callable[[GameState], int],
+        num_workers: int = 1,
+    ):
         super().__init__()
         self.max_depth = max_depth
         self.eval_fn = eval_fn
+        self.num_workers = num_workers
+        self.search = AlphaBetaSearch(eval_fn)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._best_score = None
 
     def select_move(self, game_state: GameState) -> Move:
-        best_moves = []
-        best_score = None
+        return random.choice(self.best_moves(game_state))
 
-        for possible_move in game_state.legal_moves():
-            next_state = game_state.apply_move(possible_move)
-            opponent_best_outcome = best_result(
-                next_state, self.max_depth, MIN_SCORE, MAX_SCORE, self.eval_fn
+    def best_moves(self, game_state: GameState) -> list[Move]:
+        self.search.table.clear()
+        if self.num_workers > 1:
+            return self.parallel_best_moves(game_state)
+        state = game_state.detach()
+        scores = {}
+        moves = search_moves(state)
+        for depth in range(self.max_depth + 1):
+            scores = self.score_root_moves(state, moves, depth)
+            moves.sort(key=lambda move: scores[id(move)], reverse=True)
+        best_score = scores[id(moves[0])]
+        return [move for move in moves if scores[id(move)] == best_score]
+
+    def score_root_moves(
+        self, game_state: GameState, moves: list[Move], depth: int
+    ) -> dict[int, int]:
+        scores = {}
+        best_score = MIN_SCORE
+        for move in moves:
+            game_state.play(move)
+            score = -self.search.best_result(
+                game_state, depth, MIN_SCORE - 1, 1 - best_score, 1
             )
-            our_best_outcome = -opponent_best_outcome
-            if not best_moves or our_best_outcome > best_score:
-                best_moves = [possible_move]
-                best_score = our_best_outcome
-            elif our_best_outcome == best_score:
-                best_moves.append(possible_move)
-        return random.choice(best_moves)
-
-
-def best_result(
-    game_state: GameState,
-    max_depth: int,
-    best_black: int,
-    best_white: int,
-    eval_fn: Callable[[GameState], int],
-) -> int:
-    if game_state.is_over():
-        if game_state.winner() == game_state.next_player:
-            return MAX_SCORE
-        else:
-            return MIN_SCORE
+            game_state.undo()
+            scores[id(move)] = score
+            best_score = max(best_score, score)
+        return scores
+
+    def parallel_best_moves(self, game_state: GameState) -> list[Move]:
+        if self._executor is None:
+            self._best_score = multiprocessing.Value("q", MIN_SCORE)
+            self._executor = ProcessPoolExecutor(
+                self.num_workers,
+                initializer=_init_worker,
+                initargs=(self.eval_fn, self._best_score),
+            )
+        with self._best_score.get_lock():
+            self._best_score.value = MIN_SCORE
+        state = game_state.detach()
+        moves = search_moves(state)
+        shallow_scores = self.score_root_moves(state, moves, 0)
+        moves.sort(key=lambda move: shallow_scores[id(move)], reverse=True)
+        futures = [
+            self._executor.submit(_score_root_move, state, move, self.max_depth)
+            for move in moves
+        ]
+        scores = [future.result() for future in futures]
+        best_score = max(scores)
+        return [move for move, score in zip(moves, scores) if score == best_score]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+_worker_search: Optional[AlphaBetaSearch] = None
+_worker_best_score = None
+
+
+def _init_worker(eval_fn: Callable[[GameState], int], best_score):
+    global _worker_search, _worker_best_score
+    _worker_search = AlphaBetaSearch(eval_fn)
+    _worker_best_score = best_score
+
 
-    if max_depth == 0:
-        return eval_fn(game_state)
-
-    best_result_so_far = MIN_SCORE
-    for candidate_move in game_state.legal_moves():
-        next_state = game_state.apply_move(candidate_move)
-        opponent_best_result = best_result(
-            next_state, max_depth - 1, best_black, best_white, eval_fn
-        )
-        our_result = -opponent_best_result
-        if our_result > best_result_so_far:
-            best_result_so_far = our_result
-        if game_state.next_player == Player.WHITE:
-            if best_result_so_far > best_white:
-                best_white = best_result_so_far
-            outcome_for_black = -best_result_so_far
-            if outcome_for_black < best_black:
-                return best_result_so_far
-        elif game_state.next_player == Player.BLACK:
-            if best_result_so_far > best_black:
-                best_black = best_result_so_far
-            outcome_for_white = -best_result_so_far
-            if outcome_for_white < best_white:
-                return best_result_so_far
-    return best_result_so_far
+def _score_root_move(game_state: GameState, move: Move, max_depth: int) -> int:
+    _worker_search.table.clear()
+    game_state.play(move)
+    for depth in range(max_depth):
+        _worker_search.best_result(game_state, depth, MIN_SCORE - 1, MAX_SCORE + 1, 1)
+    alpha = _worker_best_score.value - 1
+    score = -_worker_search.best_result(game_state, max_depth, MIN_SCORE - 1, -alpha, 1)
+    with _worker_best_score.get_lock():
+        if score > _worker_best_score.value:
+            _worker_best_score.value = score
+    return score
 
 
 def capture_diff(game_state: GameState) -> int:
-    black_stones = 0
-    white_stones = 0
-    for r in range(1, game_state.board.num_rows + 1):
-        for c in range(1, game_state.board.num_cols + 1):
-            p = Point(r, c)
-            color = game_state.board.get(p)
-            match color:
-                case Player.BLACK:
-                    black_stones += 1
-                case Player.WHITE:
-                    white_stones += 1
-    diff = black_stones - white_stones
-    if game_state.next_player == Player.BLACK:
-        return diff
-    return -diff
+    return game_state.board.stone_diff(game_state.next_player)
@@ -1,27 +1,28 @@
 import random
-from collections.abc import Iterable
 
 from agents.base import Agent
 from agents.helpers import is_point_an_eye
 from go.goboard import GameState, Move
-from go.gotypes import Point
 
 
 class RandomBot(Agent):
-    def __init__(self, num_rows: int, num_cols: int):
-        self.points = list(self._make_cache(num_rows, num_cols))
-
-    def _make_cache(self, num_rows: int, num_cols: int) -> Iterable[Point]:
-        for row in range(1, num_rows + 1):
-            for col in range(1, num_cols + 1):
-                yield Point(row, col)
+    def __init__(self, num_rows: int, num_cols: int, rng: random.Random = random):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.rng = rng
 
     def select_move(self, game_state: GameState):
-        random.shuffle(self.points)
-        for candidate in self.points:
+        board = game_state.board
+        player = game_state.next_player
+        candidates = board.empty_points(ordered=False)
+        while candidates:
+            index = self.rng.randrange(len(candidates))
+            candidate = candidates[index]
+            candidates[index] = candidates[-1]
+            candidates.pop()
             play = Move.play(candidate)
-            if game_state.is_valid_move(play) and not is_point_an_eye(
-                game_state.board, candidate, game_state.next_player
-            ):
+            if not is_point_an_eye(
+                board, candidate, player
+            ) and game_state.is_valid_move(play):
                 return play
         return Move.pass_turn()
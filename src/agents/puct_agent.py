@@ -0,0 +1,141 @@
+import math
+import random
+from typing import Optional, Self
+
+import numpy as np
+
+from agents.base import Agent
+from encoders.base import Encoder
+from go import playout
+from go.goboard import GameState, Move
+
+
+class PUCTNode:
+    def __init__(
+        self,
+        game_state: GameState,
+        parent: Optional[Self] = None,
+        move: Optional[Move] = None,
+        prior: float = 1.0,
+    ):
+        self.game_state = game_state
+        self.parent = parent
+        self.move = move
+        self.prior = prior
+        self.visits = 0
+        self.wins = 0
+        self.virtual_losses = 0
+        self.is_expanded = False
+        self.moves: list[Move] = []
+        self.priors = np.zeros(0)
+        self.children: dict[int, PUCTNode] = {}
+
+    def expand(self, probs: np.ndarray, encoder: Encoder, pass_prior: float):
+        moves = [move for move in self.game_state.legal_moves() if not move.is_resign]
+        priors = np.array(
+            [
+                (
+                    pass_prior
+                    if move.is_pass
+                    else probs[encoder.encode_point_index(move.point)]
+                )
+                for move in moves
+            ],
+            dtype=np.float64,
+        )
+        total = priors.sum()
+        if total > 0:
+            priors /= total
+        self.moves = moves
+        self.priors = priors
+        self.is_expanded = True
+
+    def child(self, index: int) -> Self:
+        child = self.children.get(index)
+        if child is None:
+            move = self.moves[index]
+            child_state = self.game_state.apply_move(move)
+            child = PUCTNode(child_state, self, move, float(self.priors[index]))
+            self.children[index] = child
+        return child
+
+    def record_win(self, winner):
+        self.visits += 1
+        if self.game_state.next_player.other == winner:
+            self.wins += 1
+
+
+class PUCTAgent(Agent):
+    def __init__(
+        self,
+        model,
+        encoder: Encoder,
+        num_rounds: int,
+        c_puct: float = 1.5,
+        batch_size: int = 16,
+        pass_prior: float = 0.01,
+        seed: Optional[int] = None,
+    ):
+        super().__init__()
+        self.model = model
+        self.encoder = encoder
+        self.num_rounds = num_rounds
+        self.c_puct = c_puct
+        self.batch_size = batch_size
+        self.pass_prior = pass_prior
+        self.rng = random.Random(seed)
+
+    def select_move(self, game_state: GameState) -> Move:
+        root = PUCTNode(game_state)
+        self.evaluate([root])
+        num_done = 0
+        while num_done < self.num_rounds and root.moves:
+            batch = [
+                self.select_path(root)
+                for _ in range(min(self.batch_size, self.num_rounds - num_done))
+            ]
+            leaves = {}
+            for path in batch:
+                leaf = path[-1]
+                if not leaf.is_expanded and not leaf.game_state.is_over():
+                    leaves[id(leaf)] = leaf
+            self.evaluate(list(leaves.values()))
+            for path in batch:
+                winner = playout.simulate(path[-1].game_state, self.rng)
+                for node in path:
+                    node.virtual_losses -= 1
+                    node.record_win(winner)
+            num_done += len(batch)
+        if not root.children:
+            return Move.pass_turn()
+        return max(root.children.values(), key=lambda child: child.visits).move
+
+    def evaluate(self, nodes: list[PUCTNode]):
+        if not nodes:
+            return
+        tensor = np.array([self.encoder.encode(node.game_state) for node in nodes])
+        probs = self.model.predict(tensor, verbose=0)
+        num_points = self.encoder.num_points()
+        for node, node_probs in zip(nodes, probs):
+            node.expand(node_probs[:num_points], self.encoder, self.pass_prior)
+
+    def select_path(self, root: PUCTNode) -> list[PUCTNode]:
+        path = [root]
+        node = root
+        while node.is_expanded and node.moves:
+            node = self.select_child(node)
+            path.append(node)
+        for node in path:
+            node.virtual_losses += 1
+        return path
+
+    def select_child(self, node: PUCTNode) -> PUCTNode:
+        visits = np.zeros(len(node.moves))
+        wins = np.zeros(len(node.moves))
+        for index, child in node.children.items():
+            visits[index] = child.visits + child.virtual_losses
+            wins[index] = child.wins
+        sqrt_total = math.sqrt(max(visits.sum(), 1))
+        q = np.divide(wins, visits, out=np.full_like(wins, 0.5), where=visits > 0)
+        scores = q + self.c_puct * node.priors * sqrt_total / (1 + visits)
+        return node.child(int(np.argmax(scores)))
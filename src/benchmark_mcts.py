@@ -0,0 +1,53 @@
+import time
+
+import typer
+from typing_extensions import Annotated
+
+from agents.mcts_agent import MCTSAgent, TreeParallelMCTSAgent
+from go.arrayboard import ArrayBoard
+from go.goboard import GameState
+from mcts import MCTSNode
+
+
+def playouts_per_second(agent: MCTSAgent, game_state: GameState) -> float:
+    root = MCTSNode(game_state)
+    start = time.perf_counter()
+    if agent.num_workers > 1:
+        agent.perform_parallel_rollouts(root)
+    else:
+        agent.perform_rollouts(root)
+    return root.num_rollouts / (time.perf_counter() - start)
+
+
+def main(
+    board_size: Annotated[int, typer.Option("-b")] = 9,
+    rounds: Annotated[int, typer.Option("-r")] = 2000,
+    temperature: Annotated[float, typer.Option("-t")] = 0.8,
+    max_workers: Annotated[int, typer.Option("-w")] = 8,
+    seed: Annotated[int, typer.Option("-s")] = 0,
+):
+    game_state = GameState.new_game(board_size, board_class=ArrayBoard)
+    baseline = None
+    typer.echo(f"{'workers':>7} {'playouts/s':>12} {'speedup':>8}")
+    num_workers = 1
+    while num_workers <= max_workers:
+        agent = TreeParallelMCTSAgent(
+            rounds,
+            temperature,
+            reuse_tree=False,
+            num_workers=num_workers,
+            seed=seed,
+            early_stop=False,
+        )
+        if num_workers > 1:
+            agent.perform_parallel_rollouts(MCTSNode(game_state))
+        rate = playouts_per_second(agent, game_state)
+        agent.close()
+        if baseline is None:
+            baseline = rate
+        typer.echo(f"{num_workers:>7} {rate:>12.0f} {rate / baseline:>8.2f}")
+        num_workers *= 2
+
+
+if __name__ == "__main__":
+    typer.run(main)
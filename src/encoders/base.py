@@ -14,6 +14,9 @@ class Encoder:
     def encode_point(self, point: Point):
         raise NotImplementedError()
 
+    def encode_point_index(self, point: Point) -> int:
+        raise NotImplementedError()
+
     def decode_point_index(self, index: int):
         raise NotImplementedError()
 
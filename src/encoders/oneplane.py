@@ -14,26 +14,28 @@ class OnePlaneEncoder(Encoder):
         return "oneplane"
 
     def encode(self, game_state: GameState) -> np.ndarray:
-        board_matrix = np.zeros(self.shape(), dtype=np.uint8)
+        board_matrix = np.zeros(self.shape(), dtype=np.int8)
         next_player = game_state.next_player
         for r in range(self.board_height):
             for c in range(self.board_width):
                 p = Point(row=r + 1, col=c + 1)
-                go_string = game_state.board.get_go_string(p)
-                if go_string is None:
+                color = game_state.board.get(p)
+                if color is None:
                     continue
-                if go_string.color == next_player:
+                if color == next_player:
                     board_matrix[0, r, c] = 1
                 else:
                     board_matrix[0, r, c] = -1
         return board_matrix
 
     def encode_point(self, point: Point) -> np.ndarray:
-        index = self.board_width * (point.row - 1) + (point.col - 1)
         move_one_hot = np.zeros(self.num_points(), dtype=np.uint8)
-        move_one_hot[index] = 1
+        move_one_hot[self.encode_point_index(point)] = 1
         return move_one_hot
 
+    def encode_point_index(self, point: Point) -> int:
+        return self.board_width * (point.row - 1) + (point.col - 1)
+
     def decode_point_index(self, index: int) -> Point:
         row = index // self.board_width
         col = index % self.board_width
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import numpy as np
 import typer
 from typing_extensions import Annotated
@@ -5,14 +7,22 @@ from typing_extensions import Annotated
 from agents.mcts_agent import MCTSAgent
 from bot_v_bot import print_board, print_move
 from encoders.base import get_encoder_by_name
+from go.arrayboard import ArrayBoard
 from go.goboard import GameState
 
 
-def generate_game(board_size: int, rounds: int, max_moves: int, temperature: float):
+def generate_game(
+    board_size: int,
+    rounds: int,
+    max_moves: int,
+    temperature: float,
+    num_workers: int = 1,
+    seed: Optional[int] = None,
+):
     boards, moves = [], []
     encoder = get_encoder_by_name("oneplane", board_size)
-    game = GameState.new_game(board_size)
-    bot = MCTSAgent(rounds, temperature)
+    game = GameState.new_game(board_size, board_class=ArrayBoard)
+    bot = MCTSAgent(rounds, temperature, num_workers=num_workers, seed=seed)
     num_moves = 0
     while not game.is_over():
         print_board(game.board)
@@ -26,6 +36,7 @@ def generate_game(board_size: int, rounds: int, max_moves: int, temperature: flo
         num_moves += 1
         if num_moves >= max_moves:
             break
+    bot.close()
     return np.array(boards), np.array(moves)
 
 
@@ -37,13 +48,18 @@ def main(
     temperature: Annotated[float, typer.Option("-t")] = 0.8,
     max_moves: Annotated[int, typer.Option("-m")] = 60,
     num_games: Annotated[int, typer.Option("-n")] = 10,
+    num_workers: Annotated[int, typer.Option("-w")] = 1,
+    seed: Annotated[Optional[int], typer.Option("-s")] = None,
 ):
     xs = []
     ys = []
 
     for i in range(num_games):
         print(f"Generating game {i+1}/{num_games}")
-        x, y = generate_game(board_size, rounds, max_moves, temperature)
+        game_seed = None if seed is None else seed + i
+        x, y = generate_game(
+            board_size, rounds, max_moves, temperature, num_workers, game_seed
+        )
         xs.append(x)
         ys.append(y)
 
@@ -0,0 +1,331 @@
+from typing import Optional
+
+from go.goboard import Board, GoString
+from go.gotypes import EMPTY, OFF_BOARD, Player, Point
+
+_PLAYERS = (None, Player.BLACK, Player.WHITE, None)
+
+
+class ArrayBoard(Board):
+    def __init__(self, num_rows: int, num_cols: int):
+        super().__init__(num_rows, num_cols)
+        self._stride = self.geometry.stride
+        self._height = num_rows + 2
+        size = self.geometry.size
+        self._offsets = self.geometry.offsets
+        self._points = self.geometry.index_points
+        self._color = bytearray(
+            OFF_BOARD if point is None else EMPTY for point in self._points
+        )
+        self._hash_codes = self._zobrist.point_code_lists
+        self._head = [0] * size
+        self._next = [0] * size
+        self._stone_count = [0] * size
+        self._liberties: dict[int, set[int]] = {}
+        self._owned: set[int] = set()
+        self._ko_index: Optional[int] = None
+        self._empty = {
+            index for index, color in enumerate(self._color) if color == EMPTY
+        }
+
+    @classmethod
+    def from_board(cls, board: Board) -> "ArrayBoard":
+        if isinstance(board, ArrayBoard):
+            return board.copy()
+        array_board = cls(board.num_rows, board.num_cols)
+        for index, color in enumerate(board.colors()):
+            if color != EMPTY and color != OFF_BOARD:
+                array_board._place(color, index)
+        ko_point = board.ko_point()
+        if ko_point is not None:
+            array_board._ko_index = array_board._index(ko_point)
+        array_board._num_captured = list(board._num_captured)
+        return array_board
+
+    def copy(self) -> "ArrayBoard":
+        board = object.__new__(ArrayBoard)
+        board.__dict__.update(self.__dict__)
+        board._color = self._color[:]
+        board._head = self._head[:]
+        board._next = self._next[:]
+        board._stone_count = self._stone_count[:]
+        board._liberties = self._liberties.copy()
+        board._owned = set()
+        self._owned = set()
+        board._empty = self._empty.copy()
+        board._num_stones = self._num_stones[:]
+        board._num_captured = self._num_captured[:]
+        board._undo_log = []
+        return board
+
+    def __deepcopy__(self, memo) -> "ArrayBoard":
+        return self.copy()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        del state["_offsets"], state["_points"], state["_hash_codes"]
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._offsets = self.geometry.offsets
+        self._points = self.geometry.index_points
+        self._hash_codes = self._zobrist.point_code_lists
+
+    def _snapshot(self, player: Player, point: Point):
+        index = self._index(point)
+        colors = self._color
+        heads = self._head
+        color = player.value
+        touched = []
+        for offset in self._offsets:
+            neighbor = index + offset
+            neighbor_color = colors[neighbor]
+            if neighbor_color == EMPTY or neighbor_color == OFF_BOARD:
+                continue
+            head = heads[neighbor]
+            if head in touched:
+                continue
+            touched.append(head)
+            if neighbor_color != color and len(self._liberties[head]) == 1:
+                for stone in self._chain(head):
+                    for stone_offset in self._offsets:
+                        stone_neighbor = stone + stone_offset
+                        if (
+                            colors[stone_neighbor] == color
+                            and heads[stone_neighbor] not in touched
+                        ):
+                            touched.append(heads[stone_neighbor])
+        chains = [
+            (head, colors[head], self._chain(head), set(self._liberties[head]))
+            for head in touched
+        ]
+        return index, chains, self._hash, self._ko_index, self._counters()
+
+    def _restore(self, snapshot):
+        index, chains, self._hash, self._ko_index, counters = snapshot
+        self._restore_counters(counters)
+        colors = self._color
+        heads = self._head
+        next_stones = self._next
+        colors[index] = EMPTY
+        self._empty.add(index)
+        self._liberties.pop(index, None)
+        for head, color, stones, liberties in chains:
+            self._empty.difference_update(stones)
+            previous = stones[-1]
+            for stone in stones:
+                colors[stone] = color
+                heads[stone] = head
+                next_stones[previous] = stone
+                previous = stone
+            self._stone_count[head] = len(stones)
+            self._liberties[head] = liberties
+            self._owned.add(head)
+
+    def _index(self, point: Point) -> int:
+        row = point.row
+        col = point.col
+        if 0 <= row < self._height and 0 <= col < self._stride:
+            return row * self._stride + col
+        return 0
+
+    def _own_liberties(self, head: int) -> set[int]:
+        liberties = self._liberties[head]
+        if head not in self._owned:
+            liberties = self._liberties[head] = set(liberties)
+            self._owned.add(head)
+        return liberties
+
+    def _chain(self, head: int) -> list[int]:
+        stones = [head]
+        stone = self._next[head]
+        while stone != head:
+            stones.append(stone)
+            stone = self._next[stone]
+        return stones
+
+    def is_on_grid(self, point: Point) -> bool:
+        return self._color[self._index(point)] != OFF_BOARD
+
+    def get(self, point: Point) -> Optional[Player]:
+        row = point.row
+        col = point.col
+        if 0 <= row < self._height and 0 <= col < self._stride:
+            return _PLAYERS[self._color[row * self._stride + col]]
+        return None
+
+    def get_go_string(self, point: Point) -> Optional[GoString]:
+        index = self._index(point)
+        color = self._color[index]
+        if color == EMPTY or color == OFF_BOARD:
+            return None
+        head = self._head[index]
+        return GoString(
+            _PLAYERS[color],
+            [self._points[stone] for stone in self._chain(head)],
+            [self._points[liberty] for liberty in self._liberties[head]],
+        )
+
+    def colors(self) -> list[int]:
+        return list(self._color)
+
+    def empty_points(self, ordered: bool = True) -> list[Point]:
+        points = self._points
+        indices = sorted(self._empty) if ordered else self._empty
+        return [points[index] for index in indices]
+
+    def is_self_capture(self, player: Player, point: Point) -> bool:
+        return self._is_self_capture(player.value, self._index(point))
+
+    def _is_self_capture(self, color: int, index: int) -> bool:
+        colors = self._color
+        for offset in self._offsets:
+            neighbor = index + offset
+            neighbor_color = colors[neighbor]
+            if neighbor_color == OFF_BOARD:
+                continue
+            if neighbor_color == EMPTY:
+                return False
+            num_liberties = len(self._liberties[self._head[neighbor]])
+            if neighbor_color == color:
+                if num_liberties > 1:
+                    return False
+            elif num_liberties == 1:
+                return False
+        return True
+
+    def _is_eye(self, color: int, index: int) -> bool:
+        colors = self._color
+        for offset in self._offsets:
+            neighbor_color = colors[index + offset]
+            if neighbor_color != color and neighbor_color != OFF_BOARD:
+                return False
+        friendly_corners = 0
+        off_board_corners = 0
+        stride = self._stride
+        for offset in (-stride - 1, -stride + 1, stride - 1, stride + 1):
+            corner_color = colors[index + offset]
+            if corner_color == color:
+                friendly_corners += 1
+            elif corner_color == OFF_BOARD:
+                off_board_corners += 1
+        if off_board_corners > 0:
+            return off_board_corners + friendly_corners == 4
+        return friendly_corners >= 3
+
+    def zobrist_hash_after(self, player: Player, point: Point) -> int:
+        index = self._index(point)
+        colors = self._color
+        color = player.value
+        next_hash = self._hash ^ self._hash_codes[color][index]
+        captured = []
+        for offset in self._offsets:
+            neighbor = index + offset
+            neighbor_color = colors[neighbor]
+            if neighbor_color == EMPTY or neighbor_color == OFF_BOARD:
+                continue
+            head = self._head[neighbor]
+            if (
+                neighbor_color == color
+                or len(self._liberties[head]) > 1
+                or head in captured
+            ):
+                continue
+            captured.append(head)
+            hash_codes = self._hash_codes[neighbor_color]
+            for stone in self._chain(head):
+                next_hash ^= hash_codes[stone]
+        return next_hash
+
+    def place_stone(self, player: Player, point: Point):
+        self._place(player.value, self._index(point))
+
+    def _place(self, color: int, index: int):
+        colors = self._color
+        heads = self._head
+        liberties = self._liberties
+        offsets = self._offsets
+        assert colors[index] == EMPTY
+
+        colors[index] = color
+        self._empty.discard(index)
+        self._num_stones[color] += 1
+        heads[index] = index
+        self._next[index] = index
+        self._stone_count[index] = 1
+        own_liberties = liberties[index] = set()
+        self._owned.add(index)
+        for offset in offsets:
+            neighbor = index + offset
+            neighbor_color = colors[neighbor]
+            if neighbor_color == EMPTY:
+                own_liberties.add(neighbor)
+            elif neighbor_color != OFF_BOARD:
+                self._own_liberties(heads[neighbor]).discard(index)
+
+        for offset in offsets:
+            neighbor = index + offset
+            if colors[neighbor] == color and heads[neighbor] != heads[index]:
+                self._merge(heads[index], heads[neighbor])
+
+        self._hash ^= self._hash_codes[color][index]
+
+        other = 3 - color
+        captured = 0
+        ko_index = None
+        for offset in offsets:
+            neighbor = index + offset
+            if colors[neighbor] == other and not liberties[heads[neighbor]]:
+                captured += self._stone_count[heads[neighbor]]
+                ko_index = neighbor
+                self._remove_chain(heads[neighbor])
+
+        head = heads[index]
+        if captured == 1 and self._stone_count[head] == 1 and len(liberties[head]) == 1:
+            self._ko_index = ko_index
+        else:
+            self._ko_index = None
+
+    def ko_point(self) -> Optional[Point]:
+        if self._ko_index is None:
+            return None
+        return self._points[self._ko_index]
+
+    def _merge(self, head: int, other_head: int):
+        stone_count = self._stone_count
+        if stone_count[head] < stone_count[other_head]:
+            head, other_head = other_head, head
+        heads = self._head
+        for stone in self._chain(other_head):
+            heads[stone] = head
+        next_stones = self._next
+        next_stones[head], next_stones[other_head] = (
+            next_stones[other_head],
+            next_stones[head],
+        )
+        stone_count[head] += stone_count[other_head]
+        self._own_liberties(head).update(self._liberties.pop(other_head))
+
+    def _remove_chain(self, head: int):
+        colors = self._color
+        heads = self._head
+        liberties = self._liberties
+        color = colors[head]
+        hash_codes = self._hash_codes[color]
+        self._num_stones[color] -= self._stone_count[head]
+        self._num_captured[color] += self._stone_count[head]
+        for stone in self._chain(head):
+            colors[stone] = EMPTY
+            self._empty.add(stone)
+            for offset in self._offsets:
+                neighbor = stone + offset
+                neighbor_color = colors[neighbor]
+                if (
+                    neighbor_color != EMPTY
+                    and neighbor_color != OFF_BOARD
+                    and heads[neighbor] != head
+                ):
+                    self._own_liberties(heads[neighbor]).add(stone)
+            self._hash ^= hash_codes[stone]
+        del liberties[head]
@@ -0,0 +1,263 @@
+from typing import Iterable, Optional, Self
+
+import numpy as np
+
+from go import geometry, zobrist
+from go.gotypes import EMPTY, OFF_BOARD, Player
+
+PASS = -1
+
+
+def _shift(values: np.ndarray, offset: int, fill) -> np.ndarray:
+    shifted = np.full_like(values, fill)
+    if offset > 0:
+        shifted[:, :-offset] = values[:, offset:]
+    else:
+        shifted[:, -offset:] = values[:, :offset]
+    return shifted
+
+
+class BoardBatch:
+    def __init__(self, num_boards: int, num_rows: int, num_cols: int):
+        self.num_boards = num_boards
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.geometry = geometry.for_size(num_rows, num_cols)
+        self._zobrist = zobrist.table(num_rows, num_cols)
+        size = self.geometry.size
+        stride = self.geometry.stride
+        on_board = np.array([p is not None for p in self.geometry.index_points])
+        self._board_indices = np.flatnonzero(on_board)
+        self._offsets = self.geometry.offsets
+        self._diagonal_offsets = (-stride - 1, -stride + 1, stride - 1, stride + 1)
+        self.stones = np.tile(
+            np.where(on_board, EMPTY, OFF_BOARD).astype(np.int8), (num_boards, 1)
+        )
+        self.string_ids = np.full((num_boards, size), size, dtype=np.int16)
+        self.liberties = np.zeros((num_boards, size), dtype=np.int16)
+        self.hashes = np.zeros(num_boards, dtype=np.uint64)
+        self.next_player = np.full(num_boards, Player.BLACK.value, dtype=np.int8)
+        self.ko = np.full(num_boards, PASS, dtype=np.int64)
+        self.passes = np.zeros(num_boards, dtype=np.int8)
+
+    @classmethod
+    def from_game_states(cls, game_states: Iterable["GameState"]) -> Self:
+        game_states = list(game_states)
+        board = game_states[0].board
+        batch = cls(len(game_states), board.num_rows, board.num_cols)
+        for i, game_state in enumerate(game_states):
+            batch.stones[i] = game_state.board.colors()
+            batch.hashes[i] = game_state.board.zobrist_hash()
+            batch.next_player[i] = game_state.next_player.value
+            ko_point = game_state.ko_point()
+            if ko_point is not None:
+                batch.ko[i] = batch.geometry.index(ko_point)
+            if game_state.last_move is not None and game_state.last_move.is_pass:
+                batch.passes[i] = 2 if game_state.is_over() else 1
+        batch._update_strings()
+        return batch
+
+    def _to_grid(self, flat: np.ndarray) -> np.ndarray:
+        return flat[:, self._board_indices].reshape(
+            self.num_boards, self.num_rows, self.num_cols
+        )
+
+    def _update_strings(self):
+        self._label_strings()
+        self._count_liberties()
+
+    def _label_strings(self):
+        stones = self.stones
+        size = stones.shape[1]
+        is_stone = (stones == Player.BLACK.value) | (stones == Player.WHITE.value)
+        same_color = [
+            is_stone & (_shift(stones, offset, OFF_BOARD) == stones)
+            for offset in self._offsets
+        ]
+        labels = np.where(is_stone, np.arange(size), size)
+        while True:
+            merged = labels
+            for offset, same in zip(self._offsets, same_color):
+                neighbor_labels = _shift(labels, offset, size)
+                merged = np.minimum(merged, np.where(same, neighbor_labels, size))
+            jumped = np.take_along_axis(merged, np.minimum(merged, size - 1), axis=1)
+            merged = np.where(is_stone, np.minimum(merged, jumped), size)
+            if np.array_equal(merged, labels):
+                break
+            labels = merged
+        self.string_ids = labels.astype(np.int16)
+
+    def _count_liberties(self):
+        stones = self.stones
+        labels = self.string_ids
+        size = stones.shape[1]
+        is_empty = stones == EMPTY
+        adjacent = [
+            np.where(is_empty, _shift(labels, offset, size), size)
+            for offset in self._offsets
+        ]
+        boards = np.arange(self.num_boards)[:, None] * (size + 1)
+        counts = np.zeros(self.num_boards * (size + 1), dtype=np.int64)
+        for k, candidates in enumerate(adjacent):
+            distinct = candidates < size
+            for earlier in adjacent[:k]:
+                distinct &= candidates != earlier
+            counts += np.bincount(
+                (boards + candidates)[distinct], minlength=counts.shape[0]
+            )
+        counts = counts.reshape(self.num_boards, size + 1)
+        counts[:, size] = 0
+        self.liberties = np.take_along_axis(counts, labels, axis=1).astype(np.int16)
+
+    def _merge_strings(self, boards: np.ndarray, points: np.ndarray):
+        size = self.stones.shape[1]
+        colors = self.stones[boards, points]
+        labels = self.string_ids[boards]
+        rows = np.arange(len(boards))
+        merged = points.astype(np.int16)
+        neighbor_labels = []
+        for offset in self._offsets:
+            neighbors = points + offset
+            same = self.stones[boards, neighbors] == colors
+            neighbor_label = np.where(same, labels[rows, neighbors], -1)
+            neighbor_labels.append(neighbor_label)
+            merged = np.minimum(merged, np.where(same, neighbor_label, size))
+        for neighbor_label in neighbor_labels:
+            labels = np.where(
+                labels == neighbor_label[:, None], merged[:, None], labels
+            )
+        labels[rows, points] = merged
+        self.string_ids[boards] = labels
+
+    def is_over(self) -> np.ndarray:
+        return self.passes >= 2
+
+    def play(self, moves: np.ndarray):
+        moves = np.asarray(moves)
+        active = ~self.is_over()
+        plays = active & (moves != PASS)
+        boards = np.flatnonzero(plays)
+        player = self.next_player
+        points = self._board_indices[np.where(plays, moves, 0)]
+        self.stones[boards, points[boards]] = player[boards]
+        self.hashes[boards] ^= self._zobrist.point_codes[player[boards], points[boards]]
+        self._merge_strings(boards, points[boards])
+        self._count_liberties()
+
+        captured = (
+            (self.stones == (3 - player)[:, None])
+            & (self.liberties == 0)
+            & plays[:, None]
+        )
+        num_captured = captured.sum(axis=1)
+        if num_captured.any():
+            captured_boards, captured_points = np.nonzero(captured)
+            np.bitwise_xor.at(
+                self.hashes,
+                captured_boards,
+                self._zobrist.point_codes[
+                    self.stones[captured_boards, captured_points], captured_points
+                ],
+            )
+            self.stones[captured] = EMPTY
+            self.string_ids[captured] = self.stones.shape[1]
+            self._count_liberties()
+
+        rows = np.arange(self.num_boards)
+        own_ids = self.string_ids[rows, points]
+        string_size = np.sum(self.string_ids == own_ids[:, None], axis=1)
+        is_ko = (
+            plays
+            & (num_captured == 1)
+            & (string_size == 1)
+            & (self.liberties[rows, points] == 1)
+        )
+        self.ko = np.where(
+            active, np.where(is_ko, np.argmax(captured, axis=1), PASS), self.ko
+        )
+        self.passes = np.where(
+            active & ~plays, self.passes + 1, np.where(plays, 0, self.passes)
+        ).astype(np.int8)
+        self.next_player = np.where(active, 3 - player, player).astype(np.int8)
+
+    def legal_mask(self) -> np.ndarray:
+        stones = self.stones
+        liberties = self.liberties
+        player = self.next_player[:, None]
+        breathes = np.zeros(stones.shape, dtype=bool)
+        for offset in self._offsets:
+            neighbor_stones = _shift(stones, offset, OFF_BOARD)
+            neighbor_liberties = _shift(liberties, offset, 0)
+            breathes |= (
+                (neighbor_stones == EMPTY)
+                | ((neighbor_stones == player) & (neighbor_liberties > 1))
+                | ((neighbor_stones == 3 - player) & (neighbor_liberties == 1))
+            )
+        legal = (stones == EMPTY) & breathes & ~self.is_over()[:, None]
+        has_ko = np.flatnonzero(self.ko != PASS)
+        legal[has_ko, self.ko[has_ko]] = False
+        return self._to_grid(legal)
+
+    def eye_mask(self) -> np.ndarray:
+        stones = self.stones
+        player = self.next_player[:, None]
+        eye = stones == EMPTY
+        for offset in self._offsets:
+            neighbor_stones = _shift(stones, offset, OFF_BOARD)
+            eye &= (neighbor_stones == player) | (neighbor_stones == OFF_BOARD)
+        friendly = np.zeros(stones.shape, dtype=np.int8)
+        off_board = np.zeros(stones.shape, dtype=np.int8)
+        for offset in self._diagonal_offsets:
+            diagonal_stones = _shift(stones, offset, OFF_BOARD)
+            friendly += diagonal_stones == player
+            off_board += diagonal_stones == OFF_BOARD
+        eye &= np.where(off_board > 0, off_board + friendly == 4, friendly >= 3)
+        return self._to_grid(eye)
+
+    def random_moves(self, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        if rng is None:
+            rng = np.random.default_rng()
+        candidates = (self.legal_mask() & ~self.eye_mask()).reshape(self.num_boards, -1)
+        scores = rng.random(candidates.shape) * candidates
+        return np.where(candidates.any(axis=1), np.argmax(scores, axis=1), PASS)
+
+    def score(self) -> tuple[np.ndarray, np.ndarray]:
+        stones = self.stones
+        black, white = Player.BLACK.value, Player.WHITE.value
+        empty = stones == EMPTY
+        borders = np.zeros(stones.shape, dtype=np.int8)
+        for offset in self._offsets:
+            neighbor_stones = _shift(stones, offset, OFF_BOARD)
+            borders |= np.where(
+                (neighbor_stones == black) | (neighbor_stones == white),
+                neighbor_stones,
+                0,
+            ).astype(np.int8)
+        borders = np.where(empty, borders, 0)
+        while True:
+            spread = borders
+            for offset in self._offsets:
+                spread = spread | np.where(
+                    _shift(empty, offset, False), _shift(borders, offset, 0), 0
+                )
+            spread = np.where(empty, spread, 0).astype(np.int8)
+            if np.array_equal(spread, borders):
+                break
+            borders = spread
+        black_score = np.sum((stones == black) | (empty & (borders == black)), axis=1)
+        white_score = np.sum((stones == white) | (empty & (borders == white)), axis=1)
+        return black_score, white_score
+
+    def winners(self, komi: float = 7.5) -> np.ndarray:
+        black_score, white_score = self.score()
+        return np.where(
+            black_score > white_score + komi, Player.BLACK.value, Player.WHITE.value
+        )
+
+    def encode(self) -> np.ndarray:
+        stones = self._to_grid(self.stones)
+        player = self.next_player[:, None, None]
+        planes = np.where(stones == player, 1, 0) - np.where(
+            (stones != EMPTY) & (stones != player), 1, 0
+        )
+        return planes.astype(np.int8)[:, None, :, :]
@@ -0,0 +1,81 @@
+import functools
+from dataclasses import dataclass
+
+from go.gotypes import Point
+
+
+@dataclass(frozen=True, eq=False)
+class BoardGeometry:
+    num_rows: int
+    num_cols: int
+    points: list[Point]
+    index_points: list[Point | None]
+    neighbors: list[tuple[int, ...]]
+    diagonals: list[tuple[int, ...]]
+    point_neighbors: dict[Point, tuple[Point, ...]]
+    point_diagonals: dict[Point, tuple[Point, ...]]
+
+    @property
+    def stride(self) -> int:
+        return self.num_cols + 2
+
+    @property
+    def size(self) -> int:
+        return (self.num_rows + 2) * self.stride
+
+    @property
+    def offsets(self) -> tuple[int, int, int, int]:
+        return -self.stride, self.stride, -1, 1
+
+    def index(self, point: Point) -> int:
+        return point.row * self.stride + point.col
+
+    def is_on_board(self, index: int) -> bool:
+        return self.index_points[index] is not None
+
+
+@functools.cache
+def for_size(num_rows: int, num_cols: int) -> BoardGeometry:
+    stride = num_cols + 2
+    size = (num_rows + 2) * stride
+    index_points: list[Point | None] = [None] * size
+    points = []
+    for row in range(1, num_rows + 1):
+        for col in range(1, num_cols + 1):
+            point = Point(row, col)
+            points.append(point)
+            index_points[row * stride + col] = point
+
+    def on_board(indices):
+        return tuple(index for index in indices if index_points[index] is not None)
+
+    neighbors: list[tuple[int, ...]] = [()] * size
+    diagonals: list[tuple[int, ...]] = [()] * size
+    point_neighbors = {}
+    point_diagonals = {}
+    for point in points:
+        index = point.row * stride + point.col
+        neighbors[index] = on_board(
+            (index - stride, index + stride, index - 1, index + 1)
+        )
+        diagonals[index] = on_board(
+            (
+                index - stride - 1,
+                index - stride + 1,
+                index + stride - 1,
+                index + stride + 1,
+            )
+        )
+        point_neighbors[point] = tuple(index_points[n] for n in neighbors[index])
+        point_diagonals[point] = tuple(index_points[d] for d in diagonals[index])
+
+    return BoardGeometry(
+        num_rows=num_rows,
+        num_cols=num_cols,
+        points=points,
+        index_points=index_points,
+        neighbors=neighbors,
+        diagonals=diagonals,
+        point_neighbors=point_neighbors,
+        point_diagonals=point_diagonals,
+    )
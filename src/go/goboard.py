@@ -1,9 +1,10 @@
 import copy
 from dataclasses import dataclass
-from typing import Self, Iterable, Optional, Tuple, Union, Generator
+from typing import Self, Iterable, Optional, Tuple, Union
 
-from go import zobrist
-from go.gotypes import Point, Player
+from go import geometry, zobrist
+from go.gotypes import EMPTY, OFF_BOARD, KoRule, Point, Player
+from go.history import History
 from go.scoring import compute_game_result
 
 
@@ -77,12 +78,79 @@ class Board:
     def __init__(self, num_rows: int, num_cols: int):
         self.num_rows = num_rows
         self.num_cols = num_cols
+        self.geometry = geometry.for_size(num_rows, num_cols)
         self._grid: dict[Point, Optional[GoString]] = {}
+        self._empty = set(self.geometry.points)
+        self._zobrist = zobrist.table(num_rows, num_cols)
         self._hash = zobrist.EMPTY_BOARD
+        self._ko_point: Optional[Point] = None
+        self._num_stones = [0, 0, 0]
+        self._num_captured = [0, 0, 0]
+        self._undo_log = []
 
     def __eq__(self, other):
         return isinstance(other, Board) and self._hash == other._hash
 
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["geometry"], state["_zobrist"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.geometry = geometry.for_size(self.num_rows, self.num_cols)
+        self._zobrist = zobrist.table(self.num_rows, self.num_cols)
+
+    def copy(self) -> Self:
+        board = copy.copy(self)
+        board._grid = dict(self._grid)
+        board._empty = set(self._empty)
+        board._num_stones = list(self._num_stones)
+        board._num_captured = list(self._num_captured)
+        board._undo_log = []
+        return board
+
+    def play(self, player: Player, point: Point):
+        self._undo_log.append(self._snapshot(player, point))
+        self.place_stone(player, point)
+
+    def undo(self):
+        self._restore(self._undo_log.pop())
+
+    def _snapshot(self, player: Player, point: Point):
+        neighbors = self.geometry.point_neighbors
+        touched = []
+        for neighbor in neighbors[point]:
+            neighbor_string = self._grid.get(neighbor)
+            if neighbor_string is None or neighbor_string in touched:
+                continue
+            touched.append(neighbor_string)
+            if neighbor_string.color != player and neighbor_string.num_liberties == 1:
+                for stone in neighbor_string.stones:
+                    for stone_neighbor in neighbors[stone]:
+                        string = self._grid.get(stone_neighbor)
+                        if string is not None and string.color == player:
+                            if string not in touched:
+                                touched.append(string)
+        return point, touched, self._hash, self._ko_point, self._counters()
+
+    def _counters(self) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        return tuple(self._num_stones), tuple(self._num_captured)
+
+    def _restore_counters(self, counters: tuple[tuple[int, ...], tuple[int, ...]]):
+        num_stones, num_captured = counters
+        self._num_stones = list(num_stones)
+        self._num_captured = list(num_captured)
+
+    def _restore(self, snapshot):
+        point, strings, self._hash, self._ko_point, counters = snapshot
+        self._restore_counters(counters)
+        self._grid[point] = None
+        self._empty.add(point)
+        for string in strings:
+            self._replace_string(string)
+            self._empty.difference_update(string.stones)
+
     def is_on_grid(self, point: Point) -> bool:
         return 1 <= point.row <= self.num_rows and 1 <= point.col <= self.num_cols
 
@@ -95,15 +163,28 @@ class Board:
     def get_go_string(self, point) -> Optional[GoString]:
         return self._grid.get(point)
 
+    def colors(self) -> list[int]:
+        colors = []
+        for point in self.geometry.index_points:
+            if point is None:
+                colors.append(OFF_BOARD)
+            else:
+                string = self._grid.get(point)
+                colors.append(EMPTY if string is None else string.color.value)
+        return colors
+
+    def empty_points(self, ordered: bool = True) -> list[Point]:
+        if not ordered:
+            return list(self._empty)
+        return sorted(self._empty, key=lambda point: (point.row, point.col))
+
     def place_stone(self, player: Player, point: Point):
         assert self.is_on_grid(point)
         assert self._grid.get(point) is None
         adjacent_same_color = []
         adjacent_opposite_color = []
         liberties = []
-        for neighbor in point.neighbors():
-            if not self.is_on_grid(neighbor):
-                continue
+        for neighbor in self.geometry.point_neighbors[point]:
             neighbor_string = self._grid.get(neighbor)
             if neighbor_string is None:
                 liberties.append(neighbor)
@@ -119,34 +200,108 @@ class Board:
             new_string = new_string.merge_with(same_color_string)
         for new_string_point in new_string.stones:
             self._grid[new_string_point] = new_string
+        self._empty.discard(point)
+        self._num_stones[player.value] += 1
 
-        self._hash ^= zobrist.HASH_CODE[point, player]
+        self._hash ^= self._point_code(point, player)
 
+        captured = []
         for other_color_string in adjacent_opposite_color:
             replacement = other_color_string.without_liberty(point)
             if replacement.num_liberties:
                 self._replace_string(replacement)
             else:
                 self._remove_string(other_color_string)
+                captured.extend(other_color_string.stones)
+
+        self._ko_point = None
+        if len(captured) == 1:
+            new_string = self._grid[point]
+            if len(new_string.stones) == 1 and new_string.num_liberties == 1:
+                self._ko_point = captured[0]
+
+    def is_self_capture(self, player: Player, point: Point) -> bool:
+        for neighbor in self.geometry.point_neighbors[point]:
+            neighbor_string = self._grid.get(neighbor)
+            if neighbor_string is None:
+                return False
+            if neighbor_string.color == player:
+                if neighbor_string.num_liberties > 1:
+                    return False
+            elif neighbor_string.num_liberties == 1:
+                return False
+        return True
+
+    def zobrist_hash_after(self, player: Player, point: Point) -> int:
+        next_hash = self._hash ^ self._point_code(point, player)
+        captured = []
+        for neighbor in self.geometry.point_neighbors[point]:
+            neighbor_string = self._grid.get(neighbor)
+            if (
+                neighbor_string is None
+                or neighbor_string.color == player
+                or neighbor_string.num_liberties > 1
+                or neighbor_string in captured
+            ):
+                continue
+            captured.append(neighbor_string)
+            for stone in neighbor_string.stones:
+                next_hash ^= self._point_code(stone, neighbor_string.color)
+        return next_hash
 
     def _remove_string(self, string: GoString):
+        neighbors = self.geometry.point_neighbors
         for point in string.stones:
-            for neighbor in point.neighbors():
+            for neighbor in neighbors[point]:
                 neighbor_string = self._grid.get(neighbor)
                 if neighbor_string is None:
                     continue
                 if neighbor_string is not string:
                     self._replace_string(neighbor_string.with_liberty(point))
             self._grid[point] = None
-            self._hash ^= zobrist.HASH_CODE[point, string.color]
+            self._empty.add(point)
+            self._hash ^= self._point_code(point, string.color)
+        self._num_stones[string.color.value] -= len(string.stones)
+        self._num_captured[string.color.value] += len(string.stones)
 
     def _replace_string(self, new_string):
         for point in new_string.stones:
             self._grid[point] = new_string
 
+    def _point_code(self, point: Point, player: Player) -> int:
+        index = self.geometry.index(point)
+        return self._zobrist.point_code_lists[player.value][index]
+
     def zobrist_hash(self):
         return self._hash
 
+    def num_stones(self, player: Player) -> int:
+        return self._num_stones[player.value]
+
+    def num_captured(self, player: Player) -> int:
+        return self._num_captured[player.value]
+
+    def stone_diff(self, player: Player) -> int:
+        return self._num_stones[player.value] - self._num_stones[player.other.value]
+
+    def capture_diff(self, player: Player) -> int:
+        return self._num_captured[player.other.value] - self._num_captured[player.value]
+
+    def ko_point(self) -> Optional[Point]:
+        return self._ko_point
+
+    def situation_hash(self, next_player: Player, after_pass: bool = False) -> int:
+        situation = self._hash
+        if next_player == Player.WHITE:
+            situation ^= self._zobrist.side_to_move
+        if after_pass:
+            return situation ^ self._zobrist.after_pass
+        ko_point = self.ko_point()
+        if ko_point is not None:
+            index = self.geometry.index(ko_point)
+            situation ^= self._zobrist.ko_code_list[index]
+        return situation
+
 
 class GameState:
     def __init__(
@@ -155,18 +310,21 @@ class GameState:
         next_player: Player,
         previous: Optional[Self] = None,
         move: Optional[Move] = None,
+        ko_rule: KoRule = KoRule.SITUATIONAL_SUPERKO,
     ):
         self.board = board
         self.next_player = next_player
         self.previous_state = previous
         if self.previous_state is None:
-            self.previous_states = frozenset()
+            self.history = History(ko_rule)
         else:
-            self.previous_states = frozenset(
-                previous.previous_states
-                | {(previous.next_player, previous.board.zobrist_hash())}
+            self.history = previous.history.push(
+                previous.next_player, previous.board.zobrist_hash()
             )
         self.last_move = move
+        self._previous_move = None if previous is None else previous.last_move
+        self._legal_moves: Optional[list[Move]] = None
+        self._undo_log = []
 
     def __eq__(self, other):
         return (
@@ -177,30 +335,74 @@ class GameState:
 
     def apply_move(self, move: Move) -> Self:
         if move.is_play:
-            next_board = copy.deepcopy(self.board)
+            next_board = self.board.copy()
             next_board.place_stone(self.next_player, move.point)
         else:
             next_board = self.board
         return GameState(next_board, self.next_player.other, self, move)
 
+    def detach(self) -> Self:
+        game_state = copy.copy(self)
+        game_state.board = self.board.copy()
+        game_state.previous_state = None
+        game_state._undo_log = []
+        return game_state
+
+    def play(self, move: Move):
+        self._undo_log.append(
+            (
+                self.previous_state,
+                self.history,
+                self.last_move,
+                self._previous_move,
+                self._legal_moves,
+            )
+        )
+        self.history = self.history.push(self.next_player, self.board.zobrist_hash())
+        self._legal_moves = None
+        if move.is_play:
+            self.board.play(self.next_player, move.point)
+        self.previous_state = None
+        self._previous_move = self.last_move
+        self.last_move = move
+        self.next_player = self.next_player.other
+
+    def undo(self):
+        if self.last_move.is_play:
+            self.board.undo()
+        (
+            self.previous_state,
+            self.history,
+            self.last_move,
+            self._previous_move,
+            self._legal_moves,
+        ) = self._undo_log.pop()
+        self.next_player = self.next_player.other
+
     @classmethod
-    def new_game(cls, board_size: Union[Tuple[int, int], int], handicap_stones: Optional[Iterable[Point]] = None) -> Self:
+    def new_game(
+        cls,
+        board_size: Union[Tuple[int, int], int],
+        handicap_stones: Optional[Iterable[Point]] = None,
+        board_class: type[Board] = Board,
+        ko_rule: KoRule = KoRule.SITUATIONAL_SUPERKO,
+    ) -> Self:
         first_player = Player.BLACK
         if isinstance(board_size, int):
             board_size = (board_size, board_size)
-        board = Board(*board_size)
+        board = board_class(*board_size)
         if handicap_stones is not None:
             first_player = Player.WHITE
             for stone_position in handicap_stones:
                 board.place_stone(Player.BLACK, stone_position)
-        return cls(board, first_player)
+        return cls(board, first_player, ko_rule=ko_rule)
 
     def is_over(self) -> bool:
         if self.last_move is None:
             return False
         if self.last_move.is_resign:
             return True
-        second_last_move = self.previous_state.last_move
+        second_last_move = self._previous_move
         if second_last_move is None:
             return False
         return self.last_move.is_pass and second_last_move.is_pass
@@ -208,18 +410,23 @@ class GameState:
     def is_move_self_capture(self, player: Player, move: Move) -> bool:
         if not move.is_play:
             return False
-        next_board = copy.deepcopy(self.board)
-        next_board.place_stone(player, move.point)
-        new_string = next_board.get_go_string(move.point)
-        return new_string.num_liberties == 0
+        return self.board.is_self_capture(player, move.point)
 
     def does_move_violate_ko(self, player: Player, move: Move) -> bool:
         if not move.is_play:
             return False
-        next_board = copy.deepcopy(self.board)
-        next_board.place_stone(player, move.point)
-        next_situation = (player.other, next_board.zobrist_hash())
-        return next_situation in self.previous_states
+        next_hash = self.board.zobrist_hash_after(player, move.point)
+        return self.history.repeats(player.other, next_hash)
+
+    def ko_point(self) -> Optional[Point]:
+        if self.last_move is None or not self.last_move.is_play:
+            return None
+        return self.board.ko_point()
+
+    def situation_hash(self) -> int:
+        return self.board.situation_hash(
+            self.next_player, self.last_move is not None and self.last_move.is_pass
+        )
 
     def is_valid_move(self, move: Move) -> bool:
         if self.is_over():
@@ -232,14 +439,20 @@ class GameState:
             and not self.does_move_violate_ko(self.next_player, move)
         )
 
-    def legal_moves(self) -> Generator[Move, None, None]:
-        for r in range(1, self.board.num_rows + 1):
-            for c in range(1, self.board.num_cols + 1):
-                m = Move.play(Point(r, c))
-                if self.is_valid_move(m):
-                    yield m
-        yield Move.pass_turn()
-        yield Move.resign()
+    def legal_moves(self) -> list[Move]:
+        if self._legal_moves is None:
+            self._legal_moves = []
+            if not self.is_over():
+                player = self.next_player
+                for point in self.board.empty_points():
+                    m = Move.play(point)
+                    if not self.is_move_self_capture(
+                        player, m
+                    ) and not self.does_move_violate_ko(player, m):
+                        self._legal_moves.append(m)
+            self._legal_moves.append(Move.pass_turn())
+            self._legal_moves.append(Move.resign())
+        return list(self._legal_moves)
 
     def winner(self) -> Optional[Player]:
         if not self.is_over():
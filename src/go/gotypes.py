@@ -2,6 +2,9 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Iterable, Self
 
+EMPTY = 0
+OFF_BOARD = 3
+
 
 class Player(Enum):
     BLACK = 1
@@ -12,6 +15,12 @@ class Player(Enum):
         return Player.BLACK if self == Player.WHITE else Player.WHITE
 
 
+class KoRule(Enum):
+    SIMPLE = 1
+    POSITIONAL_SUPERKO = 2
+    SITUATIONAL_SUPERKO = 3
+
+
 @dataclass(frozen=True)
 class Point:
     row: int
@@ -0,0 +1,93 @@
+from typing import Optional, Self
+
+from go import zobrist
+from go.gotypes import KoRule, Player
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_EMPTY_NODE = (None,) * (1 << _BITS)
+
+
+class HashTrie:
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, root: tuple = _EMPTY_NODE, size: int = 0):
+        self._root = root
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: int) -> bool:
+        node = self._root
+        shift = 0
+        while True:
+            entry = node[(key >> shift) & _MASK]
+            if entry is None:
+                return False
+            if type(entry) is not tuple:
+                return entry == key
+            node = entry
+            shift += _BITS
+
+    def add(self, key: int) -> Self:
+        root = self._insert(self._root, key, 0)
+        if root is None:
+            return self
+        return HashTrie(root, self._size + 1)
+
+    def _insert(self, node: tuple, key: int, shift: int) -> Optional[tuple]:
+        slot = (key >> shift) & _MASK
+        entry = node[slot]
+        if entry is None:
+            replacement = key
+        elif type(entry) is tuple:
+            replacement = self._insert(entry, key, shift + _BITS)
+            if replacement is None:
+                return None
+        elif entry == key:
+            return None
+        else:
+            replacement = self._insert(
+                self._insert(_EMPTY_NODE, entry, shift + _BITS), key, shift + _BITS
+            )
+        return node[:slot] + (replacement,) + node[slot + 1 :]
+
+
+def situation_key(player: Player, board_hash: int) -> int:
+    if player == Player.WHITE:
+        return board_hash ^ zobrist.SIDE_TO_MOVE
+    return board_hash
+
+
+class History:
+    __slots__ = ("ko_rule", "_seen", "_previous_hash")
+
+    def __init__(
+        self,
+        ko_rule: KoRule = KoRule.SITUATIONAL_SUPERKO,
+        seen: HashTrie = HashTrie(),
+        previous_hash: Optional[int] = None,
+    ):
+        self.ko_rule = ko_rule
+        self._seen = seen
+        self._previous_hash = previous_hash
+
+    def push(self, player: Player, board_hash: int) -> Self:
+        match self.ko_rule:
+            case KoRule.SIMPLE:
+                seen = self._seen
+            case KoRule.POSITIONAL_SUPERKO:
+                seen = self._seen.add(board_hash)
+            case KoRule.SITUATIONAL_SUPERKO:
+                seen = self._seen.add(situation_key(player, board_hash))
+        return History(self.ko_rule, seen, board_hash)
+
+    def repeats(self, player: Player, board_hash: int) -> bool:
+        match self.ko_rule:
+            case KoRule.SIMPLE:
+                return board_hash == self._previous_hash
+            case KoRule.POSITIONAL_SUPERKO:
+                return board_hash in self._seen
+            case KoRule.SITUATIONAL_SUPERKO:
+                return situation_key(player, board_hash) in self._seen
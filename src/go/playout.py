@@ -0,0 +1,85 @@
+import random
+from typing import Optional
+
+from go.arrayboard import ArrayBoard
+from go.gotypes import Player, Point
+from go.scoring import compute_board_result
+
+PASS = -1
+
+
+class Playout:
+    def __init__(
+        self,
+        game_state: "GameState",
+        rng: random.Random = random,
+        record_moves: bool = False,
+    ):
+        self.board = ArrayBoard.from_board(game_state.board)
+        self.next_player = game_state.next_player
+        last_move = game_state.last_move
+        self.passes = 1 if last_move is not None and last_move.is_pass else 0
+        if self.passes:
+            self.board._ko_index = None
+        self.max_moves = 3 * len(self.board.geometry.points)
+        self.rng = rng
+        self.played: Optional[dict[Player, set[int]]] = None
+        if record_moves:
+            self.played = {Player.BLACK: set(), Player.WHITE: set()}
+
+    def select_move(self) -> int:
+        board = self.board
+        color = self.next_player.value
+        ko_index = board._ko_index
+        candidates = list(board._empty)
+        randrange = self.rng.randrange
+        while candidates:
+            i = randrange(len(candidates))
+            index = candidates[i]
+            candidates[i] = candidates[-1]
+            candidates.pop()
+            if (
+                index != ko_index
+                and not board._is_eye(color, index)
+                and not board._is_self_capture(color, index)
+            ):
+                return index
+        return PASS
+
+    def play(self, index: int):
+        if index == PASS:
+            self.passes += 1
+            self.board._ko_index = None
+        else:
+            self.passes = 0
+            self.board._place(self.next_player.value, index)
+            if self.played is not None:
+                self.played[self.next_player].add(index)
+        self.next_player = self.next_player.other
+
+    def run(self) -> Player:
+        num_moves = 0
+        while self.passes < 2 and num_moves < self.max_moves:
+            self.play(self.select_move())
+            num_moves += 1
+        return compute_board_result(self.board).winner
+
+
+def simulate(game_state: "GameState", rng: random.Random = random) -> Player:
+    if game_state.is_over():
+        return game_state.winner()
+    return Playout(game_state, rng).run()
+
+
+def simulate_with_moves(
+    game_state: "GameState", rng: random.Random = random
+) -> tuple[Player, dict[Player, set[Point]]]:
+    if game_state.is_over():
+        return game_state.winner(), {Player.BLACK: set(), Player.WHITE: set()}
+    run = Playout(game_state, rng, record_moves=True)
+    winner = run.run()
+    points = run.board.geometry.index_points
+    return winner, {
+        player: {points[index] for index in indices}
+        for player, indices in run.played.items()
+    }
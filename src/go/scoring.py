@@ -1,6 +1,9 @@
 from dataclasses import dataclass
+from typing import Self
 
-from go.gotypes import Player, Point
+import numpy as np
+
+from go.gotypes import EMPTY, Player, Point
 
 
 @dataclass
@@ -26,6 +29,20 @@ class GameResult:
         return f"W+{w-self.black:.1f}"
 
 
+@dataclass
+class RegionMap:
+    stones: np.ndarray
+    owner: np.ndarray
+
+    @property
+    def dame(self) -> np.ndarray:
+        return self.owner == EMPTY
+
+    @property
+    def territory(self) -> np.ndarray:
+        return (self.stones == EMPTY) & (self.owner != EMPTY)
+
+
 class Territory:
     def __init__(self, territory_map: dict[Point, str]):
         self.black_territory = 0
@@ -48,58 +65,63 @@ class Territory:
                     self.dame += 1
                     self.dame_points.append(point)
 
+    @classmethod
+    def from_region_map(cls, regions: RegionMap) -> Self:
+        territory = cls({})
+        black, white = Player.BLACK.value, Player.WHITE.value
+        territory_owner = np.where(regions.territory, regions.owner, EMPTY)
+        territory.black_stones = int(np.count_nonzero(regions.stones == black))
+        territory.white_stones = int(np.count_nonzero(regions.stones == white))
+        territory.black_territory = int(np.count_nonzero(territory_owner == black))
+        territory.white_territory = int(np.count_nonzero(territory_owner == white))
+        dame = np.argwhere(regions.dame)
+        territory.dame = len(dame)
+        territory.dame_points = [Point(int(r) + 1, int(c) + 1) for r, c in dame]
+        return territory
+
 
-def _collect_region(
-    start_pos: Point, board: "Board", visited: dict[Point, bool] = None
-) -> tuple[list, set]:
-    if visited is None:
-        visited = {}
-    if start_pos in visited:
-        return [], set()
-    all_points = [start_pos]
-    all_borders = set()
-    visited[start_pos] = True
-    here = board.get(start_pos)
-    deltas = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    for delta_r, delta_c in deltas:
-        next_p = Point(start_pos.row + delta_r, start_pos.col + delta_c)
-        if not board.is_on_grid(next_p):
+def label_regions(board: "Board") -> RegionMap:
+    layout = board.geometry
+    neighbors = layout.neighbors
+    colors = board.colors()
+    owner = list(colors)
+    visited = bytearray(layout.size)
+    for point in layout.points:
+        start = layout.index(point)
+        if colors[start] != EMPTY or visited[start]:
             continue
-        neighbor = board.get(next_p)
-        if neighbor == here:
-            points, borders = _collect_region(next_p, board, visited)
-            all_points += points
-            all_borders |= borders
-        else:
-            all_borders.add(neighbor)
-    return all_points, all_borders
+        visited[start] = 1
+        region = [start]
+        borders = 0
+        for index in region:
+            for neighbor in neighbors[index]:
+                color = colors[neighbor]
+                if color != EMPTY:
+                    borders |= color
+                elif not visited[neighbor]:
+                    visited[neighbor] = 1
+                    region.append(neighbor)
+        if borders == Player.BLACK.value or borders == Player.WHITE.value:
+            for index in region:
+                owner[index] = borders
+
+    shape = (layout.num_rows + 2, layout.num_cols + 2)
+    return RegionMap(
+        stones=np.array(colors, dtype=np.uint8).reshape(shape)[1:-1, 1:-1],
+        owner=np.array(owner, dtype=np.uint8).reshape(shape)[1:-1, 1:-1],
+    )
 
 
 def evaluate_territory(board: "Board") -> Territory:
-    status = {}
-    for r in range(1, board.num_rows + 1):
-        for c in range(1, board.num_cols + 1):
-            p = Point(row=r, col=c)
-            if p in status:
-                continue
-            stone = board.get(p)
-            if stone is not None:
-                status[p] = stone
-            else:
-                group, neighbors = _collect_region(p, board)
-                if len(neighbors) == 1:
-                    neighbor_stone = neighbors.pop()
-                    stone_str = "b" if neighbor_stone == Player.BLACK else "w"
-                    fill_with = f"territory_{stone_str}"
-                else:
-                    fill_with = "dame"
-                for pos in group:
-                    status[pos] = fill_with
-    return Territory(status)
+    return Territory.from_region_map(label_regions(board))
 
 
 def compute_game_result(game_state: "GameState") -> GameResult:
-    territory = evaluate_territory(game_state.board)
+    return compute_board_result(game_state.board)
+
+
+def compute_board_result(board: "Board") -> GameResult:
+    territory = evaluate_territory(board)
     return GameResult(
         black=territory.black_territory + territory.black_stones,
         white=territory.white_territory + territory.white_stones,
@@ -1,16 +1,60 @@
-import random
+import functools
+from dataclasses import dataclass
 
-from go.gotypes import Player, Point
+import numpy as np
 
-MAX63 = 0x7FFFFFFFFFFFFFFF
+SEED = 20251018
+MAX_BOARD_SIZE = 25
 
-table = {}
-empty_board = 0
-for row in range(1, 20):
-    for col in range(1, 20):
-        for state in (Player.BLACK, Player.WHITE):
-            code = random.randint(0, MAX63)
-            table[Point(row, col), state] = code
+EMPTY_BOARD = 0
+SIDE_TO_MOVE, AFTER_PASS = (
+    int(code)
+    for code in np.random.default_rng(SEED).integers(
+        1, 2**64, size=2, dtype=np.uint64, endpoint=False
+    )
+)
 
-HASH_CODE = table
-EMPTY_BOARD = empty_board
+
+@dataclass(frozen=True, eq=False)
+class ZobristTable:
+    num_rows: int
+    num_cols: int
+    point_codes: np.ndarray
+    ko_codes: np.ndarray
+    side_to_move: int
+    after_pass: int
+
+    @property
+    def stride(self) -> int:
+        return self.num_cols + 2
+
+    @functools.cached_property
+    def point_code_lists(self) -> tuple[list[int], list[int], list[int]]:
+        return tuple(codes.tolist() for codes in self.point_codes)
+
+    @functools.cached_property
+    def ko_code_list(self) -> list[int]:
+        return self.ko_codes.tolist()
+
+
+@functools.cache
+def table(num_rows: int, num_cols: int) -> ZobristTable:
+    if not (1 <= num_rows <= MAX_BOARD_SIZE and 1 <= num_cols <= MAX_BOARD_SIZE):
+        raise ValueError(
+            f"Board size {num_rows}x{num_cols} exceeds {MAX_BOARD_SIZE}x{MAX_BOARD_SIZE}"
+        )
+    rng = np.random.default_rng([SEED, num_rows, num_cols])
+    size = (num_rows + 2) * (num_cols + 2)
+    codes = rng.integers(1, 2**64, size=(4, size), dtype=np.uint64, endpoint=False)
+    on_board = np.zeros((num_rows + 2, num_cols + 2), dtype=bool)
+    on_board[1:-1, 1:-1] = True
+    codes[:, ~on_board.ravel()] = 0
+    codes[0] = 0
+    return ZobristTable(
+        num_rows=num_rows,
+        num_cols=num_cols,
+        point_codes=codes[:3],
+        ko_codes=codes[3],
+        side_to_move=SIDE_TO_MOVE,
+        after_pass=AFTER_PASS,
+    )
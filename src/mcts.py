@@ -1,35 +1,107 @@
 import random
-from typing import Self
+from collections import OrderedDict
+from typing import Optional, Self
 
 from go.goboard import GameState, Move
 from go.gotypes import Player
 
 
+class TranspositionTable:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._nodes: OrderedDict[int, "MCTSNode"] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def get(self, key: int) -> Optional["MCTSNode"]:
+        node = self._nodes.get(key)
+        if node is not None:
+            self._nodes.move_to_end(key)
+        return node
+
+    def put(self, key: int, node: "MCTSNode"):
+        self._nodes[key] = node
+        self._nodes.move_to_end(key)
+        while len(self._nodes) > self.max_size:
+            self._nodes.popitem(last=False)
+
+
 class MCTSNode:
-    def __init__(self, game_state: GameState, parent: Self = None, move: Move = None):
+    def __init__(
+        self,
+        game_state: GameState,
+        parent: Self = None,
+        move: Move = None,
+        table: Optional[TranspositionTable] = None,
+    ):
         self.game_state = game_state
         self.parent = parent
         self.move = move
+        self.table = table
         self.win_counts = {Player.BLACK: 0, Player.WHITE: 0}
         self.num_rollouts = 0
+        self.virtual_losses = 0
+        self.amaf_wins = 0
+        self.amaf_rollouts = 0
         self.children: list[MCTSNode] = []
-        self.unvisited_moves = list(game_state.legal_moves())
+        self.child_moves: list[Move] = []
+        if table is not None and not game_state.is_over():
+            table.put(game_state.situation_hash(), self)
+        self.unvisited_moves = self._candidate_moves(game_state)
+
+    @staticmethod
+    def _candidate_moves(game_state: GameState) -> list[Move]:
+        if game_state.is_over():
+            return []
+        moves = [Move.play(point) for point in game_state.board.empty_points()]
+        moves.append(Move.pass_turn())
+        return moves
 
     def __eq__(self, other):
         return isinstance(other, MCTSNode) and self.game_state == other.game_state
 
-    def add_random_child(self) -> Self:
-        index = random.randint(0, len(self.unvisited_moves) - 1)
-        new_move = self.unvisited_moves.pop(index)
-        new_game_state = self.game_state.apply_move(new_move)
-        new_node = MCTSNode(new_game_state, self, new_move)
+    def add_random_child(self, rng: random.Random = random) -> Optional[Self]:
+        moves = self.unvisited_moves
+        while moves:
+            index = rng.randrange(len(moves))
+            move = moves[index]
+            moves[index] = moves[-1]
+            moves.pop()
+            if self.game_state.is_valid_move(move):
+                return self._add_node(move)
+        return None
+
+    def add_child(self, move: Move) -> Self:
+        if move in self.unvisited_moves:
+            self.unvisited_moves.remove(move)
+        return self._add_node(move)
+
+    def _add_node(self, move: Move) -> Self:
+        new_game_state = self.game_state.apply_move(move)
+        new_node = None
+        if self.table is not None and not new_game_state.is_over():
+            new_node = self.table.get(new_game_state.situation_hash())
+        if new_node is None:
+            new_node = MCTSNode(new_game_state, self, move, self.table)
         self.children.append(new_node)
+        self.child_moves.append(move)
         return new_node
 
     def record_win(self, winner: Player):
         self.win_counts[winner] += 1
         self.num_rollouts += 1
 
+    def record_amaf(self, won: bool):
+        self.amaf_wins += won
+        self.amaf_rollouts += 1
+
+    def add_virtual_loss(self):
+        self.virtual_losses += 1
+
+    def revert_virtual_loss(self):
+        self.virtual_losses -= 1
+
     def can_add_child(self) -> bool:
         return len(self.unvisited_moves) > 0
 
@@ -0,0 +1,125 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+PASS = -1
+NO_NODE = -1
+ROOT = 0
+
+
+class MCTSTree:
+    def __init__(self, max_nodes: int):
+        if max_nodes < 1:
+            raise ValueError(f"Node budget must be positive, got {max_nodes}")
+        self.max_nodes = max_nodes
+        self.visits = np.zeros(max_nodes, dtype=np.int32)
+        self.wins = np.zeros(max_nodes, dtype=np.float32)
+        self.parent = np.full(max_nodes, NO_NODE, dtype=np.int32)
+        self.first_child = np.full(max_nodes, NO_NODE, dtype=np.int32)
+        self.num_children = np.zeros(max_nodes, dtype=np.int32)
+        self.move = np.full(max_nodes, PASS, dtype=np.int16)
+        self.prior = np.zeros(max_nodes, dtype=np.float32)
+        self.num_nodes = 1
+        self.num_recycled = 0
+
+    def __len__(self) -> int:
+        return self.num_nodes
+
+    def is_expanded(self, node: int) -> bool:
+        return self.first_child[node] != NO_NODE
+
+    def has_room(self, num_moves: int) -> bool:
+        return self.num_nodes + num_moves <= self.max_nodes
+
+    def children(self, node: int) -> range:
+        first = self.first_child[node]
+        if first == NO_NODE:
+            return range(0)
+        return range(first, first + self.num_children[node])
+
+    def expand(
+        self,
+        node: int,
+        moves: Sequence[int],
+        priors: Optional[Sequence[float]] = None,
+    ) -> bool:
+        num_moves = len(moves)
+        if num_moves == 0 or self.is_expanded(node):
+            return False
+        if not self.has_room(num_moves):
+            return False
+        first = self.num_nodes
+        block = slice(first, first + num_moves)
+        self.visits[block] = 0
+        self.wins[block] = 0.0
+        self.parent[block] = node
+        self.first_child[block] = NO_NODE
+        self.num_children[block] = 0
+        self.move[block] = moves
+        self.prior[block] = 1.0 / num_moves if priors is None else priors
+        self.first_child[node] = first
+        self.num_children[node] = num_moves
+        self.num_nodes += num_moves
+        return True
+
+    def select_child(self, node: int, temperature: float) -> int:
+        children = self.children(node)
+        visits = self.visits[children.start : children.stop]
+        unvisited = np.flatnonzero(visits == 0)
+        if len(unvisited) > 0:
+            return children.start + int(unvisited[0])
+        wins = self.wins[children.start : children.stop]
+        log_visits = np.log(visits.sum())
+        scores = wins / visits + temperature * np.sqrt(log_visits / visits)
+        return children.start + int(np.argmax(scores))
+
+    def backup(self, path: Sequence[int], results: Sequence[float]):
+        path = np.asarray(path)
+        self.visits[path] += 1
+        self.wins[path] += results
+
+    def recycle(self):
+        expanded = np.flatnonzero(self.first_child[: self.num_nodes] != NO_NODE)
+        expanded = expanded[expanded != ROOT]
+        if len(expanded) == 0:
+            return
+        threshold = np.median(self.visits[expanded])
+        collapsed = np.zeros(self.num_nodes, dtype=bool)
+        collapsed[expanded[self.visits[expanded] <= threshold]] = True
+        self._compact(collapsed)
+
+    def _compact(self, collapsed: np.ndarray):
+        old_size = self.num_nodes
+        new_index = np.full(old_size, NO_NODE, dtype=np.int32)
+        new_index[ROOT] = ROOT
+        order = [ROOT]
+        num_nodes = 1
+        for old in order:
+            first = self.first_child[old]
+            if first == NO_NODE or collapsed[old]:
+                continue
+            count = self.num_children[old]
+            new_index[first : first + count] = np.arange(num_nodes, num_nodes + count)
+            order.extend(range(first, first + count))
+            num_nodes += count
+
+        kept = np.flatnonzero(new_index != NO_NODE)
+        targets = new_index[kept]
+        for name in ("visits", "wins", "move", "prior", "num_children"):
+            values = getattr(self, name)
+            values[targets] = values[kept]
+        parents = self.parent[kept]
+        self.parent[targets] = np.where(
+            parents == NO_NODE, NO_NODE, new_index[np.maximum(parents, 0)]
+        )
+        firsts = self.first_child[kept]
+        has_children = (firsts != NO_NODE) & ~collapsed[kept]
+        self.first_child[targets] = np.where(
+            has_children, new_index[np.maximum(firsts, 0)], NO_NODE
+        )
+        self.num_children[targets] = np.where(
+            has_children, self.num_children[targets], 0
+        )
+        self.first_child[num_nodes:old_size] = NO_NODE
+        self.num_recycled += old_size - num_nodes
+        self.num_nodes = num_nodes
@@ -0,0 +1,56 @@
+import random
+
+import numpy as np
+import pytest
+
+from agents.deep_learning_agent import DeepLearningAgent, candidate_mask
+from agents.helpers import is_point_an_eye
+from encoders.oneplane import OnePlaneEncoder
+from go.goboard import GameState, Move
+from go.gotypes import Point
+
+
+class FixedPolicy:
+    def __init__(self, probs: np.ndarray):
+        self.probs = probs
+
+    def predict(self, tensor: np.ndarray) -> np.ndarray:
+        return np.tile(self.probs, (len(tensor), 1))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_candidate_mask_matches_point_checks(seed: int):
+    rng = random.Random(seed)
+    game = GameState.new_game(5)
+    for _ in range(30):
+        moves = [m for m in game.legal_moves() if m.is_play]
+        if not moves:
+            break
+        game = game.apply_move(rng.choice(moves))
+    mask = candidate_mask(game)
+    for point in game.board.geometry.points:
+        move = Move.play(point)
+        expected = game.is_valid_move(move) and not is_point_an_eye(
+            game.board, point, game.next_player
+        )
+        assert mask[point.row - 1, point.col - 1] == expected
+
+
+def test_greedy_agent_skips_illegal_points():
+    game = GameState.new_game(3)
+    for point in [(1, 2), (2, 2), (2, 1), (3, 3)]:
+        game = game.apply_move(Move.play(Point(*point)))
+    game = game.apply_move(Move.pass_turn())
+    encoder = OnePlaneEncoder((3, 3))
+    probs = np.full(361, 0.01)
+    probs[encoder.encode_point_index(Point(1, 1))] = 0.9
+    probs[encoder.encode_point_index(Point(3, 1))] = 0.5
+    agent = DeepLearningAgent(FixedPolicy(probs), encoder, greedy=True)
+    assert agent.select_move(game) == Move.play(Point(3, 1))
+
+
+def test_agent_passes_without_candidates():
+    game = GameState.new_game(3).apply_move(Move.pass_turn())
+    game = game.apply_move(Move.pass_turn())
+    agent = DeepLearningAgent(FixedPolicy(np.full(361, 0.1)), OnePlaneEncoder((3, 3)))
+    assert agent.select_move(game) == Move.pass_turn()
@@ -1,10 +1,13 @@
+import time
 from pathlib import Path
 
 import pytest
 
-from agents.mcts_agent import MCTSAgent
-from go.goboard import GameState
-from go.gotypes import Player
+from agents.mcts_agent import MCTSAgent, TreeParallelMCTSAgent
+from go.arrayboard import ArrayBoard
+from go.goboard import GameState, Move
+from go.gotypes import Player, Point
+from mcts import MCTSNode
 from utils.print import print_move
 
 
@@ -19,3 +22,147 @@ def test_mcts_agent_is_play(
     move = agent.select_move(game_state)
     print_move(Player.BLACK, move)
     assert move.is_play
+
+
+def test_mcts_agent_reuses_tree():
+    agent = MCTSAgent(20, 1.5)
+    game = GameState.new_game(5)
+    game = game.apply_move(agent.select_move(game))
+
+    subtree = agent.find_root(game)
+    assert subtree is not None
+    previous_rollouts = subtree.num_rollouts
+    agent.select_move(game)
+    assert agent.root is subtree
+    assert agent.root.parent is None
+    assert agent.root.num_rollouts == previous_rollouts + 20
+
+
+def test_mcts_agents_finish_game_with_transpositions_and_reuse():
+    agents = [
+        MCTSAgent(60, 1.4, seed=2, max_transpositions=500),
+        MCTSAgent(60, 1.4, seed=3, max_transpositions=500),
+    ]
+    game = GameState.new_game(5, board_class=ArrayBoard)
+    for i in range(200):
+        if game.is_over():
+            break
+        move = agents[i % 2].select_move(game)
+        assert move is not None
+        game = game.apply_move(move)
+    assert game.is_over()
+
+
+def test_mcts_agent_without_reuse():
+    agent = MCTSAgent(10, 1.5, reuse_tree=False)
+    agent.select_move(GameState.new_game(5))
+    assert agent.root is None
+
+
+def test_parallel_mcts_merges_root_stats():
+    agent = MCTSAgent(40, 1.5, reuse_tree=False, num_workers=2, seed=3)
+    try:
+        game = GameState.new_game(5)
+        root = MCTSNode(game)
+        agent.perform_parallel_rollouts(root)
+        assert root.num_rollouts == 40
+        assert sum(child.num_rollouts for child in root.children) == 40
+        moves = [child.move for child in root.children]
+        assert len(moves) == len({(m.point, m.is_pass, m.is_resign) for m in moves})
+    finally:
+        agent.close()
+
+
+def test_parallel_mcts_is_reproducible():
+    game = GameState.new_game(5)
+    moves = []
+    for _ in range(2):
+        agent = MCTSAgent(20, 1.5, num_workers=2, seed=11)
+        try:
+            moves.append(agent.select_move(game))
+        finally:
+            agent.close()
+    assert moves[0] == moves[1]
+
+
+def test_virtual_loss_spreads_selection():
+    agent = TreeParallelMCTSAgent(10, 1.5, seed=5)
+    root = MCTSNode(GameState.new_game(5))
+    first = root.add_child(root.unvisited_moves[0])
+    second = root.add_child(root.unvisited_moves[0])
+    for child in (first, second):
+        child.record_win(Player.BLACK)
+    assert agent.select_child(root) is first
+    first.add_virtual_loss()
+    assert agent.select_child(root) is second
+    first.revert_virtual_loss()
+    assert agent.select_child(root) is first
+
+
+def test_tree_parallel_mcts_backs_up_every_rollout():
+    agent = TreeParallelMCTSAgent(30, 1.5, num_workers=2, seed=5)
+    try:
+        root = MCTSNode(GameState.new_game(5))
+        agent.perform_parallel_rollouts(root)
+        assert root.num_rollouts == 30
+        assert root.virtual_losses == 0
+        assert sum(child.num_rollouts for child in root.children) == 30
+    finally:
+        agent.close()
+
+
+def test_mcts_agent_respects_time_budget():
+    agent = MCTSAgent(1_000_000, 1.5, seed=1, max_time_ms=100)
+    start = time.perf_counter()
+    move = agent.select_move(GameState.new_game(9))
+    assert time.perf_counter() - start < 1.0
+    assert 0 < agent.root.num_rollouts < 1_000_000
+    assert move.is_play or move.is_pass
+
+
+@pytest.mark.parametrize("max_time_ms", (0, 0.001))
+def test_mcts_agent_plays_a_round_on_expired_budget(max_time_ms: float):
+    agent = MCTSAgent(100, 1.0, seed=1, max_time_ms=max_time_ms)
+    move = agent.select_move(GameState.new_game(5))
+    assert move is not None
+    assert agent.root.num_rollouts == 1
+
+
+def test_early_stop_when_leader_cannot_be_caught():
+    agent = MCTSAgent(100, 1.5)
+    root = MCTSNode(GameState.new_game(5))
+    leader = root.add_child(root.unvisited_moves[0])
+    other = root.add_child(root.unvisited_moves[0])
+    for _ in range(30):
+        leader.record_win(Player.BLACK)
+    for _ in range(10):
+        other.record_win(Player.WHITE)
+    assert agent.is_decided(root, 19)
+    assert not agent.is_decided(root, 20)
+    for _ in range(30):
+        other.record_win(Player.BLACK)
+    assert not agent.is_decided(root, 5)
+
+
+def test_record_amaf_credits_moves_played_later():
+    root = MCTSNode(GameState.new_game(5))
+    first = root.add_child(Move.play(Point(1, 1)))
+    second = root.add_child(Move.play(Point(2, 2)))
+    third = root.add_child(Move.play(Point(3, 3)))
+    reply = first.add_child(Move.play(Point(4, 4)))
+    played = {Player.BLACK: {Point(2, 2)}, Player.WHITE: {Point(3, 3)}}
+
+    MCTSAgent.record_amaf([root, first, reply], Player.BLACK, played)
+
+    assert (reply.amaf_rollouts, reply.amaf_wins) == (1, 0)
+    assert (first.amaf_rollouts, first.amaf_wins) == (1, 1)
+    assert (second.amaf_rollouts, second.amaf_wins) == (1, 1)
+    assert third.amaf_rollouts == 0
+
+
+def test_rave_search_collects_amaf_statistics():
+    agent = MCTSAgent(60, 1.5, seed=2, rave=True)
+    move = agent.select_move(GameState.new_game(5))
+    assert move.is_play or move.is_pass
+    children = agent.root.children
+    assert sum(child.amaf_rollouts for child in children) > agent.root.num_rollouts
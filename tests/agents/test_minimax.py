@@ -0,0 +1,117 @@
+import random
+
+import pytest
+
+from agents.minimax import (
+    MAX_SCORE,
+    MIN_SCORE,
+    AlphaBetaSearch,
+    MinimaxAgent,
+    capture_diff,
+    search_moves,
+)
+from go.goboard import GameState, Move
+from go.gotypes import Point
+
+
+def _negamax(game_state: GameState, depth: int) -> int:
+    if game_state.is_over():
+        if game_state.winner() == game_state.next_player:
+            return MAX_SCORE
+        return MIN_SCORE
+    if depth == 0:
+        return capture_diff(game_state)
+    return max(
+        -_negamax(game_state.apply_move(move), depth - 1)
+        for move in search_moves(game_state)
+    )
+
+
+def _key(move: Move):
+    return move.point, move.is_pass
+
+
+def _opening(moves: list[tuple[int, int]], size: int = 4) -> GameState:
+    game = GameState.new_game(size)
+    for move in moves:
+        game = game.apply_move(Move.play(Point(*move)))
+    return game
+
+
+GAMES = [
+    [],
+    [(2, 2), (2, 3), (3, 3), (1, 3)],
+    [(1, 2), (2, 2), (2, 1), (1, 1), (3, 2), (2, 3)],
+]
+
+
+def test_search_moves_skip_resign_and_pass():
+    game = GameState.new_game(3)
+    moves = search_moves(game)
+    assert len(moves) == 9
+    assert all(move.is_play for move in moves)
+    game = game.apply_move(Move.pass_turn())
+    assert Move.pass_turn() in search_moves(game)
+
+
+@pytest.mark.parametrize("moves", GAMES)
+@pytest.mark.parametrize("depth", [1, 2])
+def test_alpha_beta_matches_negamax(moves, depth: int):
+    game = _opening(moves)
+    search = AlphaBetaSearch(capture_diff)
+    expected = _negamax(game, depth)
+    assert search.best_result(game.detach(), depth, MIN_SCORE, MAX_SCORE) == expected
+    assert search.best_result(game.detach(), depth, MIN_SCORE, MAX_SCORE) == expected
+
+
+@pytest.mark.parametrize("moves", GAMES)
+def test_best_moves_match_negamax(moves):
+    game = _opening(moves)
+    agent = MinimaxAgent(1, capture_diff)
+    scores = [
+        (move, -_negamax(game.apply_move(move), 1)) for move in search_moves(game)
+    ]
+    best = max(score for _, score in scores)
+    expected = {_key(move) for move, score in scores if score == best}
+    assert {_key(move) for move in agent.best_moves(game)} == expected
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_reused_agent_matches_fresh_agent(num_workers: int):
+    rng = random.Random(1)
+    agent = MinimaxAgent(2, capture_diff, num_workers=num_workers)
+    try:
+        for _ in range(10):
+            game = GameState.new_game(4)
+            for _ in range(rng.randrange(12)):
+                game = game.apply_move(
+                    rng.choice([move for move in game.legal_moves() if move.is_play])
+                )
+            expected = {
+                _key(move) for move in MinimaxAgent(2, capture_diff).best_moves(game)
+            }
+            assert {_key(move) for move in agent.best_moves(game)} == expected
+    finally:
+        agent.close()
+
+
+def test_select_move_leaves_game_untouched():
+    game = _opening(GAMES[1])
+    board_hash = game.board.zobrist_hash()
+    MinimaxAgent(2, capture_diff).select_move(game)
+    assert game.board.zobrist_hash() == board_hash
+    assert game.last_move == Move.play(Point(1, 3))
+
+
+@pytest.mark.parametrize("moves", GAMES)
+@pytest.mark.parametrize("depth", [1, 2])
+def test_parallel_root_split_matches_serial(moves, depth: int):
+    game = _opening(moves)
+    serial = MinimaxAgent(depth, capture_diff)
+    parallel = MinimaxAgent(depth, capture_diff, num_workers=2)
+    try:
+        expected = {_key(move) for move in serial.best_moves(game)}
+        assert {_key(move) for move in parallel.best_moves(game)} == expected
+        assert {_key(move) for move in parallel.best_moves(game)} == expected
+    finally:
+        parallel.close()
@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from agents.helpers import is_point_an_eye
+from agents.naive import RandomBot
+from go.arrayboard import ArrayBoard
+from go.goboard import Board, GameState, Move
+from go.gotypes import Point
+
+
+@pytest.mark.parametrize("board_class", [Board, ArrayBoard])
+def test_random_bot_plays_legal_non_eye_moves(board_class: type[Board]):
+    game = GameState.new_game(5, board_class=board_class)
+    bot = RandomBot(5, 5, random.Random(0))
+    while not game.is_over():
+        move = bot.select_move(game)
+        if move.is_play:
+            assert game.is_valid_move(move)
+            assert not is_point_an_eye(game.board, move.point, game.next_player)
+        game = game.apply_move(move)
+    assert game.winner() is not None
+
+
+def test_random_bot_passes_when_only_eyes_remain():
+    game = GameState.new_game(3)
+    for point in [(1, 2), (3, 2), (2, 1), (2, 3), (2, 2), (3, 1)]:
+        game = game.apply_move(Move.play(Point(*point)))
+        game = game.apply_move(Move.pass_turn())
+    bot = RandomBot(3, 3, random.Random(1))
+    assert bot.select_move(game) == Move.pass_turn()
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from agents.puct_agent import PUCTAgent, PUCTNode
+from encoders.oneplane import OnePlaneEncoder
+from go.goboard import GameState, Move
+from go.gotypes import Point
+
+
+class FakePolicy:
+    def __init__(self, num_points: int, favourite: int):
+        self.num_points = num_points
+        self.favourite = favourite
+        self.batch_sizes = []
+
+    def predict(self, tensor: np.ndarray, verbose: int = 1) -> np.ndarray:
+        self.batch_sizes.append(len(tensor))
+        probs = np.full((len(tensor), 361), 0.1 / self.num_points)
+        probs[:, self.favourite] = 0.9
+        return probs
+
+
+@pytest.mark.parametrize("batch_size", [1, 8])
+def test_leaves_are_evaluated_in_batches(batch_size: int):
+    encoder = OnePlaneEncoder((5, 5))
+    model = FakePolicy(25, favourite=12)
+    agent = PUCTAgent(model, encoder, num_rounds=32, batch_size=batch_size, seed=0)
+    agent.select_move(GameState.new_game(5))
+    assert model.batch_sizes[0] == 1
+    assert len(model.batch_sizes) <= 1 + 32 // batch_size
+    assert max(model.batch_sizes) <= batch_size
+    assert sum(model.batch_sizes) > 1
+
+
+def test_prior_guides_search():
+    encoder = OnePlaneEncoder((5, 5))
+    model = FakePolicy(25, favourite=encoder.encode_point_index(Point(2, 4)))
+    agent = PUCTAgent(model, encoder, num_rounds=16, batch_size=4, seed=0)
+    assert agent.select_move(GameState.new_game(5)) == Move.play(Point(2, 4))
+
+
+def test_children_are_built_when_first_selected():
+    encoder = OnePlaneEncoder((5, 5))
+    model = FakePolicy(25, favourite=encoder.encode_point_index(Point(3, 3)))
+    agent = PUCTAgent(model, encoder, num_rounds=1, seed=0)
+    node = PUCTNode(GameState.new_game(5))
+    agent.evaluate([node])
+    assert len(node.moves) == 26
+    assert node.children == {}
+    child = agent.select_child(node)
+    assert child.move == Move.play(Point(3, 3))
+    assert child.game_state.board.get(Point(3, 3)) is not None
+    assert list(node.children.values()) == [child]
@@ -0,0 +1,91 @@
+import pickle
+import random
+from pathlib import Path
+
+import pytest
+
+from go.arrayboard import ArrayBoard
+from go.goboard import Board, GameState
+from go.gotypes import Player, Point
+from tests.conftest import read_board
+
+DATA = Path(__file__).parent.parent / "data"
+
+
+@pytest.mark.parametrize(
+    "filename_board,filename_expected,player,point",
+    [
+        (DATA / "board1.txt", DATA / "board1-expected.txt", Player.BLACK, Point(4, 6)),
+        (DATA / "board2.txt", DATA / "board2-expected.txt", Player.BLACK, Point(1, 1)),
+        (DATA / "board3.txt", DATA / "board3-expected.txt", Player.BLACK, Point(1, 1)),
+    ],
+)
+def test_capture(
+    filename_board: Path, filename_expected: Path, player: Player, point: Point
+):
+    board = read_board(filename_board, 9, 9, ArrayBoard)
+    board.place_stone(player, point)
+    expected = read_board(filename_expected, 9, 9)
+    assert board == expected
+    for r in range(1, 10):
+        for c in range(1, 10):
+            p = Point(r, c)
+            assert board.get(p) == expected.get(p)
+            assert board.get_go_string(p) == expected.get_go_string(p)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_dict_board(seed: int):
+    rng = random.Random(seed)
+    reference = GameState.new_game(7)
+    game = GameState.new_game(7, board_class=ArrayBoard)
+    for _ in range(80):
+        candidates = [m for m in reference.legal_moves() if m.is_play]
+        if not candidates:
+            break
+        move = rng.choice(candidates)
+        reference = reference.apply_move(move)
+        game = game.apply_move(move)
+        assert game.board.zobrist_hash() == reference.board.zobrist_hash()
+        for r in range(1, 8):
+            for c in range(1, 8):
+                p = Point(r, c)
+                assert game.board.get(p) == reference.board.get(p)
+                assert game.board.get_go_string(p) == reference.board.get_go_string(p)
+    assert isinstance(game.board, Board)
+
+
+def test_off_grid():
+    board = ArrayBoard(5, 5)
+    assert not board.is_on_grid(Point(0, 3))
+    assert not board.is_on_grid(Point(6, 6))
+    assert board.get(Point(0, 3)) is None
+    assert board.get_go_string(Point(7, 1)) is None
+    assert not board.is_on_grid(Point(0, 8))
+    assert not board.is_on_grid(Point(-1, 3))
+    assert board.is_on_grid(Point(5, 5))
+
+
+def test_copies_do_not_share_liberties():
+    board = ArrayBoard(5, 5)
+    board.place_stone(Player.BLACK, Point(3, 3))
+    copied = board.copy()
+    copied.place_stone(Player.WHITE, Point(3, 4))
+    assert board.get_go_string(Point(3, 3)).num_liberties == 4
+    assert copied.get_go_string(Point(3, 3)).num_liberties == 3
+    board.place_stone(Player.WHITE, Point(2, 3))
+    assert board.get_go_string(Point(3, 3)).num_liberties == 3
+    assert copied.get_go_string(Point(3, 3)).liberties == frozenset(
+        [Point(2, 3), Point(4, 3), Point(3, 2)]
+    )
+
+
+@pytest.mark.parametrize("board_class", [Board, ArrayBoard])
+def test_pickle_round_trip(board_class: type[Board]):
+    board = read_board(DATA / "board1.txt", 9, 9, board_class)
+    restored = pickle.loads(pickle.dumps(board))
+    assert restored.geometry is board.geometry
+    assert restored.colors() == board.colors()
+    restored.place_stone(Player.BLACK, Point(4, 6))
+    board.place_stone(Player.BLACK, Point(4, 6))
+    assert restored == board
@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from go.arrayboard import ArrayBoard
+from go.goboard import Board, GameState
+from go.gotypes import Point
+
+
+@pytest.mark.parametrize("board_class", [Board, ArrayBoard])
+@pytest.mark.parametrize("seed", range(3))
+def test_analytic_legality_matches_playing_the_move(
+    board_class: type[Board], seed: int
+):
+    rng = random.Random(seed)
+    game = GameState.new_game(5, board_class=board_class)
+    for _ in range(50):
+        for r in range(1, 6):
+            for c in range(1, 6):
+                point = Point(r, c)
+                if game.board.get(point) is not None:
+                    continue
+                for player in (game.next_player, game.next_player.other):
+                    next_board = game.board.copy()
+                    next_board.place_stone(player, point)
+                    assert game.board.is_self_capture(player, point) == (
+                        next_board.get_go_string(point).num_liberties == 0
+                    )
+                    assert (
+                        game.board.zobrist_hash_after(player, point)
+                        == next_board.zobrist_hash()
+                    )
+        moves = [m for m in game.legal_moves() if m.is_play]
+        if not moves:
+            break
+        game = game.apply_move(rng.choice(moves))
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from go.arrayboard import ArrayBoard
+from go.goboard import Board, GameState, Move
+from go.gotypes import Player, Point
+
+
+def board_contents(board: Board):
+    points = [
+        Point(r, c)
+        for r in range(1, board.num_rows + 1)
+        for c in range(1, board.num_cols + 1)
+    ]
+    assert board.empty_points() == [p for p in points if board.get(p) is None]
+    colors = [board.get(p) for p in points]
+    for player in (Player.BLACK, Player.WHITE):
+        assert board.num_stones(player) == colors.count(player)
+    counters = [
+        (board.num_stones(player), board.num_captured(player))
+        for player in (Player.BLACK, Player.WHITE)
+    ]
+    return [board.get_go_string(p) for p in points], counters
+
+
+@pytest.mark.parametrize("board_class", [Board, ArrayBoard])
+@pytest.mark.parametrize("seed", range(3))
+def test_play_undo_matches_apply_move(board_class: type[Board], seed: int):
+    rng = random.Random(seed)
+    game = GameState.new_game(5, board_class=board_class)
+    states = [game]
+    history = []
+    initial_moves = game.legal_moves()
+    for _ in range(60):
+        if game.is_over():
+            break
+        moves = [m for m in game.legal_moves() if not m.is_resign]
+        move = rng.choice(moves)
+        expected = states[-1].apply_move(move)
+        history.append((game.board.zobrist_hash(), board_contents(game.board)))
+        game.play(move)
+        assert game == expected
+        assert board_contents(game.board) == board_contents(expected.board)
+        assert game.is_over() == expected.is_over()
+        assert game.legal_moves() == expected.legal_moves()
+        states.append(expected)
+    while history:
+        zobrist_hash, contents = history.pop()
+        game.undo()
+        assert game.board.zobrist_hash() == zobrist_hash
+        assert board_contents(game.board) == contents
+    assert game.last_move is None
+    assert game.legal_moves() == initial_moves
+    assert game.is_valid_move(Move.play(Point(3, 3)))
+
+
+@pytest.mark.parametrize("board_class", [Board, ArrayBoard])
+def test_copy_is_independent(board_class: type[Board]):
+    board = board_class(5, 5)
+    board.place_stone(Player.BLACK, Point(1, 1))
+    copied = board.copy()
+    copied.place_stone(Player.WHITE, Point(1, 2))
+    copied.place_stone(Player.WHITE, Point(2, 1))
+    assert board.get(Point(1, 1)) == Player.BLACK
+    assert board.get(Point(1, 2)) is None
+    assert copied.get(Point(1, 1)) is None
+    assert board.num_stones(Player.BLACK) == 1
+    assert board.num_captured(Player.BLACK) == 0
+    assert copied.num_captured(Player.BLACK) == 1
+    assert copied.stone_diff(Player.WHITE) == 2
+    assert copied.capture_diff(Player.WHITE) == 1
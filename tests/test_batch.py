@@ -0,0 +1,65 @@
+import numpy as np
+
+from agents.helpers import is_point_an_eye
+from go.arrayboard import ArrayBoard
+from go.batch import PASS, BoardBatch
+from go.goboard import GameState, Move
+from go.gotypes import KoRule, Player
+from go.scoring import evaluate_territory
+
+
+def test_batch_matches_game_states():
+    rng = np.random.default_rng(3)
+    num_boards, size = 6, 5
+    batch = BoardBatch(num_boards, size, size)
+    games = [
+        GameState.new_game(size, board_class=ArrayBoard, ko_rule=KoRule.SIMPLE)
+        for _ in range(num_boards)
+    ]
+    points = batch.geometry.points
+    for _ in range(60):
+        legal = batch.legal_mask().reshape(num_boards, -1)
+        eyes = batch.eye_mask().reshape(num_boards, -1)
+        for i, game in enumerate(games):
+            if game.is_over():
+                assert batch.is_over()[i]
+                continue
+            for j, point in enumerate(points):
+                assert legal[i, j] == (
+                    game.board.get(point) is None
+                    and game.is_valid_move(Move.play(point))
+                )
+                assert eyes[i, j] == is_point_an_eye(
+                    game.board, point, game.next_player
+                )
+        moves = batch.random_moves(rng)
+        batch.play(moves)
+        for i, move in enumerate(moves):
+            if games[i].is_over():
+                continue
+            if move == PASS:
+                games[i] = games[i].apply_move(Move.pass_turn())
+            else:
+                games[i] = games[i].apply_move(Move.play(points[move]))
+        for i, game in enumerate(games):
+            assert list(batch.stones[i]) == game.board.colors()
+            assert int(batch.hashes[i]) == game.board.zobrist_hash()
+            assert batch.next_player[i] == game.next_player.value
+
+    black, white = batch.score()
+    for i, game in enumerate(games):
+        territory = evaluate_territory(game.board)
+        assert black[i] == territory.black_stones + territory.black_territory
+        assert white[i] == territory.white_stones + territory.white_territory
+
+
+def test_from_game_states_and_encode():
+    game = GameState.new_game(5)
+    game = game.apply_move(Move.play(game.board.geometry.points[0]))
+    batch = BoardBatch.from_game_states([game, GameState.new_game(5)])
+    planes = batch.encode()
+    assert planes.shape == (2, 1, 5, 5)
+    assert planes[0, 0, 0, 0] == -1
+    assert not planes[1].any()
+    assert batch.next_player[0] == Player.WHITE.value
+    assert not batch.legal_mask()[0, 0, 0]
@@ -0,0 +1,33 @@
+from go import geometry
+from go.gotypes import Point
+
+
+def test_geometry_is_cached():
+    assert geometry.for_size(9, 9) is geometry.for_size(9, 9)
+    assert geometry.for_size(9, 9) is not geometry.for_size(9, 13)
+
+
+def test_neighbors_and_diagonals():
+    layout = geometry.for_size(9, 9)
+    corner = Point(1, 1)
+    assert set(layout.point_neighbors[corner]) == {Point(2, 1), Point(1, 2)}
+    assert layout.point_diagonals[corner] == (Point(2, 2),)
+    assert len(layout.point_neighbors[Point(1, 5)]) == 3
+    assert len(layout.point_neighbors[Point(5, 5)]) == 4
+    assert len(layout.point_diagonals[Point(5, 5)]) == 4
+    assert set(layout.point_neighbors[Point(5, 5)]) == set(Point(5, 5).neighbors())
+
+
+def test_points_are_interned():
+    layout = geometry.for_size(5, 7)
+    assert len(layout.points) == 35
+    for point in layout.points:
+        index = layout.index(point)
+        assert layout.index_points[index] is point
+        assert layout.is_on_board(index)
+        for neighbor_index, neighbor in zip(
+            layout.neighbors[index], layout.point_neighbors[point]
+        ):
+            assert layout.index_points[neighbor_index] is neighbor
+    assert not layout.is_on_board(0)
+    assert not layout.is_on_board(layout.size - 1)
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from go.goboard import GameState, Move
+from go.gotypes import KoRule, Player, Point
+from go.history import HashTrie, History
+
+
+def test_hash_trie_is_persistent():
+    rng = random.Random(0)
+    keys = [rng.getrandbits(63) for _ in range(2000)]
+    versions = [HashTrie()]
+    for key in keys:
+        versions.append(versions[-1].add(key))
+    assert len(versions[-1]) == len(keys)
+    assert all(key in versions[-1] for key in keys)
+    assert keys[999] in versions[1000]
+    assert keys[1000] not in versions[1000]
+    assert versions[-1].add(keys[0]) is versions[-1]
+
+
+def test_hash_trie_colliding_prefixes():
+    trie = HashTrie().add(1).add(1 + (1 << 40)).add(1 + (1 << 62))
+    assert 1 in trie
+    assert 1 + (1 << 40) in trie
+    assert 1 + (1 << 62) in trie
+    assert 1 + (1 << 41) not in trie
+
+
+@pytest.mark.parametrize(
+    "ko_rule,same_side,other_side,older",
+    [
+        (KoRule.SIMPLE, True, True, False),
+        (KoRule.POSITIONAL_SUPERKO, True, True, True),
+        (KoRule.SITUATIONAL_SUPERKO, True, False, True),
+    ],
+)
+def test_ko_rules(ko_rule: KoRule, same_side: bool, other_side: bool, older: bool):
+    history = History(ko_rule).push(Player.WHITE, 11).push(Player.BLACK, 22)
+    assert history.repeats(Player.BLACK, 22) == same_side
+    assert history.repeats(Player.WHITE, 22) == other_side
+    assert history.repeats(Player.WHITE, 11) == older
+    assert not history.repeats(Player.BLACK, 33)
+
+
+@pytest.mark.parametrize("ko_rule", list(KoRule))
+def test_ko_is_rejected(ko_rule: KoRule):
+    game = GameState.new_game(5, ko_rule=ko_rule)
+    for point in [
+        Point(1, 2),
+        Point(1, 3),
+        Point(2, 1),
+        Point(2, 4),
+        Point(3, 2),
+        Point(3, 3),
+        Point(4, 4),
+        Point(2, 2),
+        Point(2, 3),
+    ]:
+        game = game.apply_move(Move.play(point))
+    assert not game.is_valid_move(Move.play(Point(2, 2)))
+    assert game.is_valid_move(Move.play(Point(5, 5)))
+
+
+def test_ko_point_is_cleared_by_pass():
+    game = GameState.new_game(5)
+    for point in [
+        Point(1, 2),
+        Point(1, 3),
+        Point(2, 1),
+        Point(2, 4),
+        Point(3, 2),
+        Point(3, 3),
+        Point(4, 4),
+        Point(2, 2),
+        Point(2, 3),
+    ]:
+        game = game.apply_move(Move.play(point))
+    assert game.ko_point() == Point(2, 2)
+    passed = game.apply_move(Move.pass_turn())
+    assert passed.ko_point() is None
+    assert passed.situation_hash() == passed.board.situation_hash(
+        Player.BLACK, after_pass=True
+    )
@@ -0,0 +1,83 @@
+import random
+
+from agents.mcts_agent import MCTSAgent
+from go.goboard import GameState, Move
+from go.gotypes import Point
+from mcts import MCTSNode, TranspositionTable
+
+
+def _key(move: Move):
+    return move.point, move.is_pass, move.is_resign
+
+
+def test_node_defers_validation():
+    game = GameState.new_game(5)
+    node = MCTSNode(game)
+    assert len(node.unvisited_moves) == 26
+    assert Move.resign() not in node.unvisited_moves
+    assert Move.pass_turn() in node.unvisited_moves
+
+
+def test_expansion_only_creates_legal_children():
+    game = GameState.new_game(3)
+    for point in [(1, 2), (2, 2), (2, 1), (3, 3)]:
+        game = game.apply_move(Move.play(Point(*point)))
+    game = game.apply_move(Move.pass_turn())
+    node = MCTSNode(game)
+    rng = random.Random(1)
+    while node.can_add_child():
+        node.add_random_child(rng)
+    children = {_key(child.move) for child in node.children}
+    legal = {_key(move) for move in game.legal_moves() if not move.is_resign}
+    assert children == legal
+    assert _key(Move.play(Point(1, 1))) not in children
+
+
+def test_finished_game_has_no_candidates():
+    game = GameState.new_game(3).apply_move(Move.resign())
+    assert not MCTSNode(game).can_add_child()
+
+
+def test_transposition_table_evicts_least_recent():
+    table = TranspositionTable(2)
+    nodes = [MCTSNode(GameState.new_game(3)) for _ in range(3)]
+    table.put(1, nodes[0])
+    table.put(2, nodes[1])
+    assert table.get(1) is nodes[0]
+    table.put(3, nodes[2])
+    assert len(table) == 2
+    assert table.get(2) is None
+    assert table.get(1) is nodes[0]
+
+
+def test_transpositions_share_nodes():
+    table = TranspositionTable(100)
+    root = MCTSNode(GameState.new_game(5), table=table)
+    first = root.add_child(Move.play(Point(1, 1)))
+    first = first.add_child(Move.play(Point(2, 2)))
+    first = first.add_child(Move.play(Point(3, 3)))
+    second = root.add_child(Move.play(Point(3, 3)))
+    parent = second.add_child(Move.play(Point(2, 2)))
+    second = parent.add_child(Move.play(Point(1, 1)))
+    assert first is second
+    assert parent.child_moves == [Move.play(Point(1, 1))]
+    assert second.parent is not parent
+
+
+def test_finished_game_is_not_shared_with_live_position():
+    table = TranspositionTable(100)
+    root = MCTSNode(GameState.new_game(5), table=table)
+    end = root.add_child(Move.pass_turn()).add_child(Move.pass_turn())
+    assert end is not root
+    assert end.is_terminal()
+    assert len(table) == 2
+
+
+def test_agent_backs_up_along_path_with_transpositions():
+    agent = MCTSAgent(60, 1.5, seed=4, max_transpositions=1000)
+    game = GameState.new_game(3)
+    agent.select_move(game)
+    root = agent.root
+    assert root.table is not None
+    assert root.num_rollouts == 60
+    assert sum(child.num_rollouts for child in root.children) == 60
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from agents.array_mcts_agent import ArrayMCTSAgent
+from go.goboard import GameState
+from mcts_tree import NO_NODE, ROOT, MCTSTree
+
+
+def test_expand_and_backup():
+    tree = MCTSTree(10)
+    assert tree.expand(ROOT, [5, 6, 7])
+    assert list(tree.children(ROOT)) == [1, 2, 3]
+    assert np.allclose(tree.prior[1:4], 1 / 3)
+    assert tree.select_child(ROOT, 1.0) == 1
+    tree.backup([ROOT, 1], [0.0, 1.0])
+    assert tree.select_child(ROOT, 1.0) == 2
+    assert not tree.expand(ROOT, [8])
+    assert not tree.expand(1, list(range(7)))
+
+
+def test_recycle_collapses_least_visited_subtrees():
+    tree = MCTSTree(12)
+    tree.expand(ROOT, [1, 2])
+    tree.expand(1, [3, 4, 5])
+    tree.expand(2, [6, 7, 8])
+    tree.expand(3, [9, 10])
+    for path in ([ROOT, 1, 3], [ROOT, 1, 3], [ROOT, 1, 4], [ROOT, 2, 6]):
+        tree.backup(path, [0.0] * len(path))
+
+    tree.recycle()
+
+    assert len(tree) == 6
+    assert tree.num_recycled == 5
+    assert list(tree.move[tree.children(ROOT)]) == [1, 2]
+    assert tree.num_children[2] == 0 and tree.first_child[2] == NO_NODE
+    busiest = tree.children(1)
+    assert list(tree.move[busiest]) == [3, 4, 5]
+    assert all(tree.parent[child] == 1 for child in busiest)
+    assert tree.visits[1] == 3 and tree.visits[3] == 2
+    assert not tree.is_expanded(3)
+
+
+@pytest.mark.parametrize("max_nodes", [80, 100_000])
+def test_agent_respects_node_budget(max_nodes: int):
+    game = GameState.new_game(5)
+    agent = ArrayMCTSAgent(200, 1.5, max_nodes=max_nodes, seed=2)
+    move = agent.select_move(game)
+    assert game.is_valid_move(move)
+    assert len(agent.tree) <= max_nodes
+    assert agent.tree.visits[ROOT] == 200
+    assert (agent.tree.num_recycled > 0) == (max_nodes == 80)
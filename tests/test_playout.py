@@ -0,0 +1,77 @@
+import random
+from pathlib import Path
+
+import pytest
+
+from agents.helpers import is_point_an_eye
+from go import playout
+from go.arrayboard import ArrayBoard
+from go.goboard import GameState, Move
+from go.gotypes import Player, Point
+from tests.conftest import read_board
+
+DATA = Path(__file__).parent / "data"
+
+
+@pytest.mark.parametrize("filename", ["board1.txt", "board4.txt", "board5.txt"])
+def test_from_board_matches(filename: str):
+    board = read_board(DATA / filename, 9, 9)
+    array_board = ArrayBoard.from_board(board)
+    assert array_board.colors() == board.colors()
+    assert array_board.zobrist_hash() == board.zobrist_hash()
+    for player in (Player.BLACK, Player.WHITE):
+        assert array_board.num_stones(player) == board.num_stones(player)
+    for point in board.geometry.points:
+        assert array_board.get_go_string(point) == board.get_go_string(point)
+
+
+def test_from_board_keeps_ko():
+    game = GameState.new_game(5)
+    for point in [(1, 2), (1, 3), (2, 1), (2, 4), (3, 2), (3, 3), (2, 3)]:
+        game = game.apply_move(Move.play(Point(*point)))
+    game = game.apply_move(Move.play(Point(2, 2)))
+    assert game.board.ko_point() == Point(2, 3)
+    assert ArrayBoard.from_board(game.board).ko_point() == Point(2, 3)
+
+
+def test_playout_ignores_ko_after_pass():
+    game = GameState.new_game(5)
+    for point in [(1, 2), (1, 3), (2, 1), (2, 4), (3, 2), (3, 3), (2, 3)]:
+        game = game.apply_move(Move.play(Point(*point)))
+    game = game.apply_move(Move.play(Point(2, 2)))
+    game = game.apply_move(Move.pass_turn())
+    assert playout.Playout(game).board.ko_point() is None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_playout_never_fills_own_eyes(seed: int):
+    game = GameState.new_game(7)
+    run = playout.Playout(game, random.Random(seed))
+    while run.passes < 2:
+        index = run.select_move()
+        if index != playout.PASS:
+            point = run.board.geometry.index_points[index]
+            assert not is_point_an_eye(run.board, point, run.next_player)
+            assert not run.board.is_self_capture(run.next_player, point)
+        run.play(index)
+    assert isinstance(run.run(), Player)
+
+
+def test_simulate_is_reproducible():
+    game = GameState.new_game(9)
+    winners = [playout.simulate(game, random.Random(7)) for _ in range(2)]
+    assert winners[0] == winners[1]
+
+
+def test_simulate_finished_game():
+    game = GameState.new_game(5)
+    game = game.apply_move(Move.resign())
+    assert playout.simulate(game) == Player.WHITE
+
+
+def test_simulate_with_moves_records_points():
+    game = GameState.new_game(5)
+    winner, played = playout.simulate_with_moves(game, random.Random(3))
+    assert isinstance(winner, Player)
+    assert played[Player.BLACK] and played[Player.WHITE]
+    assert played[Player.BLACK] <= set(game.board.geometry.points)
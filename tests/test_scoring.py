@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from go.arrayboard import ArrayBoard
+from go.goboard import Board
+from go.gotypes import Player, Point
+from go.scoring import evaluate_territory, label_regions
+
+
+def make_board(board_class: type[Board], rows: list[str]) -> Board:
+    board = board_class(len(rows), len(rows[0]))
+    for r, line in enumerate(rows, start=1):
+        for c, stone in enumerate(line, start=1):
+            match stone:
+                case "x":
+                    board.place_stone(Player.BLACK, Point(r, c))
+                case "o":
+                    board.place_stone(Player.WHITE, Point(r, c))
+    return board
+
+
+@pytest.mark.parametrize("board_class", [Board, ArrayBoard])
+def test_evaluate_territory(board_class: type[Board]):
+    board = make_board(
+        board_class,
+        [
+            ".x.o.",
+            "xx.oo",
+            ".....",
+            "ooooo",
+            ".o..o",
+        ],
+    )
+    territory = evaluate_territory(board)
+    assert territory.black_stones == 3
+    assert territory.white_stones == 10
+    assert territory.black_territory == 1
+    assert territory.white_territory == 4
+    assert territory.dame == 7
+    assert Point(3, 1) in territory.dame_points
+    assert Point(1, 3) in territory.dame_points
+
+
+@pytest.mark.parametrize("board_class", [Board, ArrayBoard])
+def test_label_regions(board_class: type[Board]):
+    board = make_board(board_class, ["x..", "x.o", "..."])
+    regions = label_regions(board)
+    assert regions.stones.shape == (3, 3)
+    assert np.array_equal(
+        regions.owner,
+        np.array([[1, 0, 0], [1, 0, 2], [0, 0, 0]], dtype=np.uint8),
+    )
+    assert regions.dame.sum() == 6
+
+
+def test_large_empty_region():
+    board = Board(25, 25)
+    board.place_stone(Player.WHITE, Point(13, 13))
+    territory = evaluate_territory(board)
+    assert territory.white_territory == 25 * 25 - 1
+    assert territory.dame == 0
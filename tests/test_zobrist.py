@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from go import zobrist
+from go.arrayboard import ArrayBoard
+from go.goboard import Board, GameState, Move
+from go.gotypes import Player, Point
+
+
+def test_table_is_reproducible():
+    table = zobrist.table(9, 9)
+    regenerated = zobrist.table.__wrapped__(9, 9)
+    assert table.point_codes.dtype == np.uint64
+    assert np.array_equal(table.point_codes, regenerated.point_codes)
+    assert np.array_equal(table.ko_codes, regenerated.ko_codes)
+    assert zobrist.table(9, 9) is table
+
+
+def test_table_sizes():
+    table = zobrist.table(25, 25)
+    assert table.point_codes.shape == (3, 27 * 27)
+    assert not table.point_codes[0].any()
+    assert table.point_codes[1, 0] == 0
+    assert table.point_codes[1, 1 * 27 + 1] != 0
+    with pytest.raises(ValueError):
+        zobrist.table(26, 19)
+
+
+@pytest.mark.parametrize("board_class", [Board, ArrayBoard])
+def test_situation_hash(board_class: type[Board]):
+    game = GameState.new_game(5, board_class=board_class)
+    for point in [
+        Point(1, 2),
+        Point(1, 3),
+        Point(2, 1),
+        Point(2, 4),
+        Point(3, 2),
+        Point(3, 3),
+        Point(4, 4),
+        Point(2, 2),
+    ]:
+        game = game.apply_move(Move.play(point))
+    assert game.board.ko_point() is None
+    board_hash = game.board.zobrist_hash()
+    assert game.situation_hash() == board_hash
+    assert game.board.situation_hash(Player.WHITE) == board_hash ^ zobrist.SIDE_TO_MOVE
+    game = game.apply_move(Move.play(Point(2, 3)))
+    assert game.board.ko_point() == Point(2, 2)
+    assert game.situation_hash() != game.board.zobrist_hash() ^ zobrist.SIDE_TO_MOVE
+    game = game.apply_move(Move.play(Point(5, 5)))
+    assert game.board.ko_point() is None